@@ -12,8 +12,7 @@ It allows users to capture screen regions and generate captions using local AI m
 
 import os
 import sys
-import threading
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import wx
 import gui
@@ -29,9 +28,11 @@ if os.path.exists(_libsDir) and _libsDir not in sys.path:
 	sys.path.insert(0, _libsDir)
 
 from .imageDescriber import ImageDescriber
-from .modelManager import ModelManagerFrame
 from .panel import CaptionLocalSettingsPanel
 
+if TYPE_CHECKING:
+	from .modelManager import ModelManagerFrame
+
 try:
 	import addonHandler
 	addonHandler.initTranslation()
@@ -39,13 +40,17 @@ except:
 	pass
 
 # Module-level configuration
-_here = os.path.dirname(__file__)
 _modelsDir = os.path.abspath(os.path.join(_here, "..", "..", "models"))
+# Downloads are network bound, so use more concurrent downloads than cores, within what a host tolerates
+_defaultDownloadWorkers = min(16, max(4, (os.cpu_count() or 4) * 2))
 
 CONFSPEC = {
 	"modelsDir": f"string(default={_modelsDir})",
 	"currentModel": "string(default=Xenova/vit-gpt2-image-captioning)",
-	"loadModelWhenInit": "boolean(default=true)"
+	"loadModelWhenInit": "boolean(default=true)",
+	"maxDownloadWorkers": f"integer(default={_defaultDownloadWorkers}, min=1, max=16)",
+	"resumeDownloads": "boolean(default=true)",
+	"modelPrecision": 'option("quantized", "int8", "uint8", "fp32", default="quantized")',
 }
 
 config.conf.spec['captionLocal'] = CONFSPEC
@@ -69,7 +74,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""Initialize the global plugin."""
 		super().__init__()
 		self.imageDescriber = ImageDescriber()
-		self.managerFrame: Optional[ModelManagerFrame] = None
+		self.managerFrame: Optional["ModelManagerFrame"] = None
 		self.menu = gui.mainFrame.sysTrayIcon.toolsMenu
 		self.manager_item = self.menu.Append(wx.ID_ANY, _("Model Manager"))
 		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.script_openManager, self.manager_item)
@@ -81,6 +86,10 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""Clean up resources when the plugin is terminated."""
 		if self.imageDescriber:
 			self.imageDescriber.terminate()
+		if self.managerFrame:
+			# Closing is vetoed into a hide while the plugin runs, so force it here
+			self.managerFrame.Close(force=True)
+			self.managerFrame = None
 		try:
 			gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(CaptionLocalSettingsPanel)
 		except (ValueError, AttributeError):
@@ -129,6 +138,8 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			"""Show the model manager window."""
 			try:
 				if not self.managerFrame:
+					# Imported on first use, so NVDA does not load the manager UI at startup
+					from .modelManager import ModelManagerFrame
 					self.managerFrame = ModelManagerFrame()
 				
 				self.managerFrame.Show()
@@ -4,12 +4,51 @@
 # This file may be used under the terms of the GNU General Public License, version 2 or later, as modified by the NVDA license.
 # For full terms and any additional permissions, see the NVDA license file: https://github.com/nvaccess/nvda/blob/master/copying.txt
 
-import json
 import os
+import threading
+import weakref
 
 from logHandler import log
 from .base import ImageCaptioner
 
+# Use orjson when it is bundled, it parses JSON several times faster than the json module
+try:
+	from orjson import loads as _jsonLoads
+except ImportError:
+	from json import loads as _jsonLoads
+
+# Captioners still referenced elsewhere (e.g. by a running caption thread), keyed by the files they load.
+# Reloading the same model while one is alive reuses it instead of building new ONNX sessions.
+_captionerCache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_captionerCacheLock = threading.Lock()
+# Held while the captioner of a cache key is built, so building one model doesn't block loading another
+_captionerBuildLocks: dict[tuple, threading.Lock] = {}
+
+# File name suffixes of the ONNX weight variants published in Hugging Face ONNX repositories, by precision.
+# Only variants with float32 inputs and outputs are listed, as captioners bind float32 tensors.
+ONNX_PRECISION_SUFFIXES: dict[str, str] = {
+	"quantized": "_quantized",
+	"int8": "_int8",
+	"uint8": "_uint8",
+	"fp32": "",
+}
+DEFAULT_ONNX_PRECISION = "quantized"
+
+
+def onnxVariantFileName(fileName: str, precision: str) -> str:
+	"""Get the file name of another precision variant of a quantized ONNX model file.
+
+	For example ``onnx/encoder_model_quantized.onnx`` becomes ``onnx/encoder_model_int8.onnx`` for ``int8``.
+
+	:param fileName: Name of a file of the model.
+	:param precision: One of the keys of :data:`ONNX_PRECISION_SUFFIXES`.
+	:return: The variant file name, or ``fileName`` unchanged if it is not a quantized ONNX model file.
+	"""
+	defaultEnding = f"{ONNX_PRECISION_SUFFIXES[DEFAULT_ONNX_PRECISION]}.onnx"
+	if not fileName.endswith(defaultEnding):
+		return fileName
+	return f"{fileName[: -len(defaultEnding)]}{ONNX_PRECISION_SUFFIXES[precision]}.onnx"
+
 
 def imageCaptionerFactory(
 	configPath: str,
@@ -17,10 +56,55 @@ def imageCaptionerFactory(
 	decoderPath: str | None = None,
 	monomericModelPath: str | None = None,
 ) -> ImageCaptioner:
-	"""Initialize the image caption generator."""
+	"""Initialize the image caption generator, reusing a live instance for the same model files."""
+	# Files replaced in place (e.g. by a forced re-download) have another version, so they are loaded again
+	cacheKey = tuple(
+		(path, _fileVersion(path)) for path in (configPath, encoderPath, decoderPath, monomericModelPath)
+	)
+	with _captionerCacheLock:
+		captioner = _captionerCache.get(cacheKey)
+		if captioner is not None:
+			log.debug(f"Reusing loaded image captioner for {configPath}")
+			return captioner
+		buildLock = _captionerBuildLocks.setdefault(cacheKey, threading.Lock())
+	try:
+		with buildLock:
+			# Another thread may have built it while this one waited
+			with _captionerCacheLock:
+				captioner = _captionerCache.get(cacheKey)
+			if captioner is None:
+				captioner = _createImageCaptioner(configPath, encoderPath, decoderPath, monomericModelPath)
+				with _captionerCacheLock:
+					_captionerCache[cacheKey] = captioner
+			else:
+				log.debug(f"Reusing loaded image captioner for {configPath}")
+	finally:
+		with _captionerCacheLock:
+			_captionerBuildLocks.pop(cacheKey, None)
+	return captioner
+
+
+def _fileVersion(path: str | None) -> tuple[int, int] | None:
+	"""Get the modification time and size of a model file, None if there is no such file."""
+	if path is None:
+		return None
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return (stat.st_mtime_ns, stat.st_size)
+
+
+def _createImageCaptioner(
+	configPath: str,
+	encoderPath: str | None = None,
+	decoderPath: str | None = None,
+	monomericModelPath: str | None = None,
+) -> ImageCaptioner:
+	"""Create the image caption generator matching the model architecture in the config file."""
 	try:
-		with open(configPath, "r", encoding="utf-8") as f:
-			config = json.load(f)
+		with open(configPath, "rb") as f:
+			config = _jsonLoads(f.read())
 	except FileNotFoundError:
 		raise FileNotFoundError(
 			f"Caption model config file {configPath} not found, "
@@ -5,6 +5,10 @@
 # For full terms and any additional permissions, see the NVDA license file: https://github.com/nvaccess/nvda/blob/master/copying.txt
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	import numpy as np
 
 
 class ImageCaptioner(ABC):
@@ -14,12 +18,34 @@ class ImageCaptioner(ABC):
 	"""
 
 	@abstractmethod
-	def generateCaption(self, image: str | bytes, maxLength: int | None = None) -> str:
+	def generateCaption(self, image: "str | bytes | np.ndarray", maxLength: int | None = None) -> str:
 		"""
 		Generate a caption for the given image.
 
-		:param image: Image file path or binary data.
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
 		:param maxLength: Optional maximum length for the generated caption.
 		:return: The generated image caption as a string.
 		"""
 		pass
+
+	def prepareImage(self, image: "str | bytes | np.ndarray", maxLength: int | None = None) -> object:
+		"""
+		Do the image dependent work that can run while an earlier caption is still being generated.
+
+		The default implementation does no work, captioners override it to preprocess and encode the image.
+
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
+		:param maxLength: Optional maximum length for the generated caption.
+		:return: Prepared input for :meth:`generateCaptionFromPrepared`.
+		"""
+		return (image, maxLength)
+
+	def generateCaptionFromPrepared(self, prepared: object) -> str:
+		"""
+		Generate a caption for an image returned by :meth:`prepareImage`.
+
+		:param prepared: The prepared image.
+		:return: The generated image caption as a string.
+		"""
+		image, maxLength = prepared
+		return self.generateCaption(image, maxLength)
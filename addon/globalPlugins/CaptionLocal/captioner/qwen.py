@@ -8,10 +8,13 @@ import os
 import subprocess
 import tempfile
 import io
-from PIL import Image
+from typing import TYPE_CHECKING
 from logHandler import log
 from .base import ImageCaptioner
 
+if TYPE_CHECKING:
+	import numpy as np
+
 try:
 	_
 except NameError:
@@ -55,14 +58,16 @@ class QwenImageCaptioner(ImageCaptioner):
 
 	def generateCaption(
 		self,
-		image: str | bytes,
+		image: "str | bytes | np.ndarray",
 		maxLength: int | None = None,
 	) -> str:
 		"""Generate image caption using CLI.
 
-		:param image: Image file path or binary data.
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
 		:param maxLength: Optional maximum tokens.
 		"""
+		from PIL import Image
+
 		temp_file_path = None
 		image_path = None
 
@@ -72,6 +77,8 @@ class QwenImageCaptioner(ImageCaptioner):
 				img = Image.open(image)
 			elif isinstance(image, bytes):
 				img = Image.open(io.BytesIO(image))
+			elif hasattr(image, "__array_interface__"):
+				img = Image.fromarray(image)
 			else:
 				# If it's a string but doesn't exist, it might be intended as bytes or error
 				if isinstance(image, str):
@@ -81,7 +88,7 @@ class QwenImageCaptioner(ImageCaptioner):
 			# Resize if larger than MAX_IMAGE_SIZE
 			width, height = img.size
 			if max(width, height) > self.MAX_IMAGE_SIZE:
-				img.thumbnail((self.MAX_IMAGE_SIZE, self.MAX_IMAGE_SIZE), Image.Resampling.LANCZOS)
+				img.thumbnail((self.MAX_IMAGE_SIZE, self.MAX_IMAGE_SIZE), Image.Resampling.BILINEAR)
 				# Save to a temporary JPEG file
 				with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
 					if img.mode != "RGB":
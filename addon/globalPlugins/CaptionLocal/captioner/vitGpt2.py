@@ -5,16 +5,32 @@
 # For full terms and any additional permissions, see the NVDA license file: https://github.com/nvaccess/nvda/blob/master/copying.txt
 
 import os
-import json
+import glob
+import hashlib
+import marshal
 import re
 import io
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import numpy as np
-from PIL import Image
 
 from logHandler import log
 
+try:
+	import cv2
+except ImportError:
+	cv2 = None
+
+# orjson parses the large vocab.json several times faster, use it when it is bundled
+try:
+	from orjson import loads as _jsonLoads
+except ImportError:
+	from json import loads as _jsonLoads
+
 from .base import ImageCaptioner
 from ..modelConfig import (
 	_EncoderConfig,
@@ -26,6 +42,44 @@ from ..modelConfig import (
 )
 from .. import modelConfig
 
+if TYPE_CHECKING:
+	import onnxruntime as ort
+
+# Number of captions memoized per captioner
+_CAPTION_CACHE_SIZE = 32
+
+# Tokens dropped from decoded captions
+_SPECIAL_TOKENS = frozenset({"<|endoftext|>", "<|pad|>"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Bump when the decoded vocabulary layout changes, to invalidate vocabulary caches on disk
+_VOCAB_CACHE_VERSION = 1
+
+# Map resample integers from preprocessor_config.json (PIL.Image.Resampling values) to OpenCV flags.
+# Pillow's box-like filters antialias when downscaling, INTER_AREA is the closest OpenCV equivalent.
+# Screenshots are almost always downscaled to the model input size, where an 8 tap Lanczos kernel
+# costs several times more than INTER_AREA without helping a ViT trained on bilinear resizing.
+_CV2_INTERPOLATION = {} if cv2 is None else {
+	0: cv2.INTER_NEAREST,
+	1: cv2.INTER_AREA,
+	2: cv2.INTER_AREA,
+	3: cv2.INTER_CUBIC,
+	4: cv2.INTER_AREA,
+	5: cv2.INTER_AREA,
+}
+
+
+@dataclass(frozen=True)
+class _PreparedImage:
+	"""An image encoded by :meth:`VitGpt2ImageCaptioner.prepareImage`."""
+
+	cacheKey: tuple
+	maxLength: int | None
+	encoderHiddenStates: np.ndarray | None = None
+	# The caption, when it was already cached while preparing the image
+	caption: str | None = None
+
 
 class VitGpt2ImageCaptioner(ImageCaptioner):
 	"""Lightweight ONNX Runtime image captioning model.
@@ -56,8 +110,8 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 
 		# Load configuration file
 		try:
-			with open(configPath, "r", encoding="utf-8") as f:
-				self.config = json.load(f)
+			with open(configPath, "rb") as f:
+				self.config = _jsonLoads(f.read())
 		except FileNotFoundError:
 			raise FileNotFoundError(
 				f"Caption model config file {configPath} not found, "
@@ -74,19 +128,19 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 
 		preprocessorPath = os.path.join(configDir, "preprocessor_config.json")
 		self.preprocessorConfig = self._loadPreprocessorConfig(preprocessorPath)
+		self._initNormalization()
 
 		# Load all model parameters from configuration
 		self._loadModelParams()
 
-		# Configure ONNX Runtime session
-		sessionOptions = ort.SessionOptions()
-		if enableProfiling:
-			sessionOptions.enable_profiling = True
-
 		# Load ONNX models
 		try:
-			self.encoderSession = ort.InferenceSession(encoderPath, sess_options=sessionOptions)
-			self.decoderSession = ort.InferenceSession(decoderPath, sess_options=sessionOptions)
+			# ONNX Runtime releases the GIL while loading and optimizing a graph, so build both sessions at once
+			with ThreadPoolExecutor(max_workers=2, thread_name_prefix="CreateCaptionSession") as executor:
+				encoderFuture = executor.submit(self._createSession, encoderPath, enableProfiling)
+				decoderFuture = executor.submit(self._createSession, decoderPath, enableProfiling)
+			self.encoderSession = encoderFuture.result()
+			self.decoderSession = decoderFuture.result()
 		except (
 			ort.capi.onnxruntime_pybind11_state.InvalidProtobuf,
 			ort.capi.onnxruntime_pybind11_state.NoSuchFile,
@@ -96,13 +150,150 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 				f" Please check whether the file is complete or re-download. Original error: {e}",
 			) from e
 
-		log.debug(
-			f"Loaded ONNX models - Encoder: {os.path.basename(encoderPath)}, Decoder: {os.path.basename(decoderPath)}",
-		)
-		log.debug(f"Loaded config : {os.path.basename(configPath)}")
-		log.debug(f"Loaded vocabulary : {os.path.basename(vocabPath)}")
-		log.debug(
-			f"Model config - Image size: {self.encoderConfig.image_size}, Max length: {self.decoderConfig.max_length}",
+		self._encoderInputName = self.encoderSession.get_inputs()[0].name
+		self._decoderOutputNames = self._getDecoderOutputNames()
+		self._pastKeyValueOutputs = self._mapPastKeyValueOutputs()
+		mappedOutputs = {outputIndex for _pastName, outputIndex in self._pastKeyValueOutputs}
+		self._otherDecoderOutputNames = [
+			name for index, name in enumerate(self._decoderOutputNames[1:], start=1) if index not in mappedOutputs
+		]
+		# Ping-pong key/value buffers, (re)allocated by _ensureKeyValueBuffers
+		self._keyValueBufferLength = 0
+		self._keyValueBuffers: list[np.ndarray] = []
+		self._keyValueBufferPointers: list[list[int]] = []
+		self._decoderIoBinding = self.decoderSession.io_binding()
+		# Decoder inputs reused across steps and captions.
+		# The OrtValue shares memory with the NumPy buffer, so writing a token ID into
+		# self._inputIds updates the bound input without rebinding it.
+		self._inputIds = np.empty((1, 1), dtype=np.int64)
+		self._inputIdsValue = ort.OrtValue.ortvalue_from_numpy(self._inputIds)
+		self._useCacheBranchValue = ort.OrtValue.ortvalue_from_numpy(np.array([1], dtype=np.bool_))
+		self._logitsBuffer = self._allocateLogitsBuffer()
+		self._initialPastKeyValues = self._initializePastKeyValues(batchSize=1)
+		self._captionCache: OrderedDict[tuple, str] = OrderedDict()
+		# Images are prepared and captioned on different threads, which both use the caption cache
+		self._captionCacheLock = threading.Lock()
+
+		if log.isEnabledFor(log.DEBUG):
+			log.debug(
+				f"Loaded captioner - Encoder: {os.path.basename(encoderPath)}, "
+				f"Decoder: {os.path.basename(decoderPath)}, Config: {os.path.basename(configPath)}, "
+				f"Vocabulary: {os.path.basename(vocabPath)} ({self.vocabSize} tokens), "
+				f"Image size: {self.encoderConfig.image_size}, Max length: {self.decoderConfig.max_length}",
+			)
+
+	@staticmethod
+	def _createSessionOptions(enableProfiling: bool = False):
+		"""Create ONNX Runtime session options tuned for CPU inference.
+
+		Enables all graph optimizations and uses half of the logical cores for intra-op
+		parallelism, so that captioning does not starve NVDA of CPU time.
+
+		:param enableProfiling: Whether to enable ONNX Runtime profiling.
+		:return: Configured ``onnxruntime.SessionOptions``.
+		"""
+		import onnxruntime as ort
+
+		sessionOptions = ort.SessionOptions()
+		sessionOptions.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+		sessionOptions.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+		sessionOptions.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+		sessionOptions.inter_op_num_threads = 1
+		# Don't busy-wait between ops, idle worker threads would otherwise keep cores spinning
+		sessionOptions.add_session_config_entry("session.intra_op.allow_spinning", "0")
+		# Captions are generated one image at a time. Pinning the batch dimension lets ORT resolve
+		# more shapes while planning, so fewer intermediate buffers are allocated at run time.
+		sessionOptions.add_free_dimension_override_by_name("batch_size", 1)
+		if enableProfiling:
+			sessionOptions.enable_profiling = True
+		return sessionOptions
+
+	@staticmethod
+	def _optimizedModelPath(modelPath: str) -> str:
+		"""Get the path of the cached optimized graph for a model file.
+
+		The ONNX Runtime version is part of the file name, since the ORT format and the graph
+		optimizations it captured may change between releases.
+
+		:param modelPath: Path to the source ONNX model.
+		:return: Path of the optimized model in ORT format, next to the source model.
+		"""
+		import onnxruntime as ort
+
+		return f"{os.path.splitext(modelPath)[0]}.ort-{ort.__version__}.opt.ort"
+
+	@staticmethod
+	def _removeStaleOptimizedModels(modelPath: str, cachePath: str) -> None:
+		"""Delete optimized graphs of a model cached by other ONNX Runtime versions.
+
+		:param modelPath: Path to the source ONNX model.
+		:param cachePath: Path of the optimized model to keep.
+		"""
+		baseName = os.path.basename(os.path.splitext(modelPath)[0])
+		pattern = os.path.join(glob.escape(os.path.dirname(modelPath)), f"{glob.escape(baseName)}.*opt.ort")
+		for stalePath in glob.glob(pattern):
+			if os.path.normcase(stalePath) == os.path.normcase(cachePath):
+				continue
+			try:
+				os.remove(stalePath)
+			except OSError:
+				log.debugWarning(f"Could not remove stale optimized model {stalePath}", exc_info=True)
+
+	def _createSession(self, modelPath: str, enableProfiling: bool = False):
+		"""Create an inference session, reusing the optimized graph cached on disk if possible.
+
+		On first load the optimized graph is serialized next to the model, so later loads skip
+		parsing and most graph optimization work.
+
+		:param modelPath: Path to the ONNX model.
+		:param enableProfiling: Whether to enable ONNX Runtime profiling.
+		:return: The ``onnxruntime.InferenceSession``.
+		"""
+		import onnxruntime as ort
+
+		cachePath = self._optimizedModelPath(modelPath)
+		try:
+			isCacheFresh = os.path.getmtime(cachePath) >= os.path.getmtime(modelPath)
+		except OSError:
+			isCacheFresh = False
+
+		if isCacheFresh:
+			try:
+				return ort.InferenceSession(
+					cachePath,
+					sess_options=self._createSessionOptions(enableProfiling),
+					providers=["CPUExecutionProvider"],
+				)
+			except Exception:
+				log.warning(f"Discarding unusable optimized model {cachePath}", exc_info=True)
+
+		sessionOptions = self._createSessionOptions(enableProfiling)
+		# Hardware specific optimizations are applied when the cache is loaded,
+		# so the serialized graph stays usable if the models directory moves to another machine.
+		sessionOptions.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+		sessionOptions.optimized_model_filepath = cachePath
+		try:
+			session = ort.InferenceSession(
+				modelPath,
+				sess_options=sessionOptions,
+				providers=["CPUExecutionProvider"],
+			)
+		except (
+			ort.capi.onnxruntime_pybind11_state.InvalidProtobuf,
+			ort.capi.onnxruntime_pybind11_state.NoSuchFile,
+		):
+			raise
+		except Exception:
+			# e.g. the models directory is read-only
+			log.warning(f"Could not cache optimized model to {cachePath}", exc_info=True)
+		else:
+			self._removeStaleOptimizedModels(modelPath, cachePath)
+			return session
+
+		return ort.InferenceSession(
+			modelPath,
+			sess_options=self._createSessionOptions(enableProfiling),
+			providers=["CPUExecutionProvider"],
 		)
 
 	def _loadModelParams(self) -> None:
@@ -134,19 +325,32 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 		# Load main model configuration
 		self.modelConfig = _createConfigFromDict(_ModelConfig, self.config, modelConfig._DEFAULT_MODEL_CONFIG)
 
-	def _loadVocab(self, vocabPath: str) -> dict[int, str]:
+	def _loadVocab(self, vocabPath: str) -> list[str]:
 		"""Load vocabulary file.
 
+		The decoded list is cached next to vocab.json, so later loads skip parsing the JSON.
+
 		:param vocabPath: Path to vocab.json file.
-		:return: Dictionary mapping token IDs to tokens.
+		:return: List of tokens indexed by token ID, special tokens and unused IDs map to an empty string.
 		"""
 		try:
-			with open(vocabPath, "r", encoding="utf-8") as f:
-				vocabData = json.load(f)
-
-			# Convert to id -> token format
-			vocab = {v: k for k, v in vocabData.items()}
-			log.debug(f"Successfully loaded vocabulary with {len(vocab)} tokens")
+			vocabStat = os.stat(vocabPath)
+			cacheKey = (_VOCAB_CACHE_VERSION, marshal.version, vocabStat.st_mtime_ns, vocabStat.st_size)
+			vocab = self._loadVocabCache(vocabPath, cacheKey)
+			if vocab is not None:
+				return vocab
+
+			with open(vocabPath, "rb") as f:
+				vocabData = _jsonLoads(f.read())
+
+			# Token IDs are dense, so index tokens by ID in a list rather than a dict
+			vocab = [""] * (max(vocabData.values(), default=-1) + 1)
+			for token, tokenId in vocabData.items():
+				# Blank special tokens here, so decoding drops them without comparing every token
+				if token not in _SPECIAL_TOKENS:
+					vocab[tokenId] = token
+			log.debug(f"Successfully loaded vocabulary with {len(vocabData)} tokens")
+			self._saveVocabCache(vocabPath, cacheKey, vocab)
 			return vocab
 
 		except FileNotFoundError:
@@ -156,11 +360,53 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 			log.exception(f"Could not load vocabulary from {vocabPath}")
 			raise
 
+	@staticmethod
+	def _vocabCachePath(vocabPath: str) -> str:
+		"""Get the path of the decoded vocabulary cache for a vocab.json file."""
+		return f"{os.path.splitext(vocabPath)[0]}.marshal"
+
+	def _loadVocabCache(self, vocabPath: str, cacheKey: tuple) -> list[str] | None:
+		"""Load the decoded vocabulary cached for a vocab.json file.
+
+		:param vocabPath: Path to vocab.json file.
+		:param cacheKey: Cache version and vocab.json modification time and size the cache must match.
+		:return: The cached vocabulary, or None if there is no usable cache.
+		"""
+		cachePath = self._vocabCachePath(vocabPath)
+		try:
+			with open(cachePath, "rb") as f:
+				cachedKey, vocab = marshal.loads(f.read())
+		except FileNotFoundError:
+			return None
+		except Exception:
+			log.debugWarning(f"Ignoring unreadable vocabulary cache {cachePath}", exc_info=True)
+			return None
+		if tuple(cachedKey) != cacheKey:
+			return None
+		return vocab
+
+	def _saveVocabCache(self, vocabPath: str, cacheKey: tuple, vocab: list[str]) -> None:
+		"""Cache a decoded vocabulary next to its vocab.json file.
+
+		:param vocabPath: Path to vocab.json file.
+		:param cacheKey: Cache version and vocab.json modification time and size.
+		:param vocab: The decoded vocabulary.
+		"""
+		cachePath = self._vocabCachePath(vocabPath)
+		tempPath = f"{cachePath}.tmp"
+		try:
+			with open(tempPath, "wb") as f:
+				f.write(marshal.dumps((cacheKey, vocab)))
+			os.replace(tempPath, cachePath)
+		except OSError:
+			# e.g. the models directory is read-only
+			log.debugWarning(f"Could not cache vocabulary to {cachePath}", exc_info=True)
+
 	def _loadPreprocessorConfig(self, preprocessorPath: str) -> _PreprocessorConfig:
 		"""Load preprocessor configuration from preprocessor_config.json."""
 		try:
-			with open(preprocessorPath, "r", encoding="utf-8") as f:
-				preprocessor_dict = json.load(f)
+			with open(preprocessorPath, "rb") as f:
+				preprocessor_dict = _jsonLoads(f.read())
 		except FileNotFoundError:
 			log.warning("Preprocessor config not found, using defaults")
 			return modelConfig._DEFAULT_PREPROCESSOR_CONFIG
@@ -171,54 +417,123 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 				modelConfig._DEFAULT_PREPROCESSOR_CONFIG,
 			)
 
-	def _preprocessImage(self, image: str | bytes) -> np.ndarray:
-		"""Preprocess image for model input using external configuration.
+	def _initNormalization(self) -> None:
+		"""Precompute the per-channel transform applied to uint8 pixels.
+
+		Rescaling and normalization are folded into ``(pixel - offset) * scale``,
+		so preprocessing needs a single pass over the image.
+		"""
+		rescale = self.preprocessorConfig.rescale_factor if self.preprocessorConfig.do_rescale else 1.0
+		if self.preprocessorConfig.do_normalize:
+			mean = np.array(self.preprocessorConfig.image_mean, dtype=np.float64)
+			std = np.array(self.preprocessorConfig.image_std, dtype=np.float64)
+		else:
+			mean = np.zeros(3)
+			std = np.ones(3)
+
+		# (pixel * rescale - mean) / std == (pixel - mean / rescale) * (rescale / std)
+		# Shaped (C, 1, 1) to broadcast over channel-first pixels
+		self._pixelOffset = (mean / rescale).astype(np.float32).reshape(3, 1, 1)
+		self._pixelScale = (rescale / std).astype(np.float32).reshape(3, 1, 1)
+		# Model input buffer reused across images, (re)allocated when the image size changes
+		self._pixelValues: np.ndarray | None = None
+
+	def _targetSize(self) -> tuple[int, int] | None:
+		"""Get the (width, height) to resize to, or None if resizing is disabled."""
+		if not self.preprocessorConfig.do_resize:
+			return None
+		return (
+			self.preprocessorConfig.size["width"],
+			self.preprocessorConfig.size["height"],
+		)
+
+	def _loadImageWithOpenCV(self, image: str | bytes) -> np.ndarray | None:
+		"""Decode and resize an image with OpenCV.
 
 		:param image: Image file path or binary data.
-		:return: Preprocessed image array ready for model input.
+		:return: RGB uint8 array of shape (H, W, 3), or None if OpenCV cannot decode the image.
+		"""
+		if isinstance(image, str) and os.path.isfile(image):
+			# cv2.imread cannot open non-ASCII paths on Windows, so read the bytes ourselves
+			encoded = np.fromfile(image, dtype=np.uint8)
+		else:
+			encoded = np.frombuffer(image, dtype=np.uint8)
+
+		bgr = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+		if bgr is None:
+			return None
+
+		targetSize = self._targetSize()
+		if targetSize is not None:
+			interpolation = _CV2_INTERPOLATION.get(self.preprocessorConfig.resample, cv2.INTER_AREA)
+			bgr = cv2.resize(bgr, targetSize, interpolation=interpolation)
+
+		return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+	def _loadImageWithPillow(self, image: str | bytes) -> np.ndarray:
+		"""Decode and resize an image with Pillow.
+
+		:param image: Image file path or binary data.
+		:return: RGB uint8 array of shape (H, W, 3).
 		"""
-		# Load image
+		# Pillow is only needed when OpenCV is unavailable or cannot decode the image
+		from PIL import Image
+
 		if isinstance(image, str) and os.path.isfile(image):
 			img = Image.open(image).convert("RGB")
 		else:
 			img = Image.open(io.BytesIO(image)).convert("RGB")
 
-		# Resize image if configured
-		if self.preprocessorConfig.do_resize:
-			target_size = (
-				self.preprocessorConfig.size["width"],
-				self.preprocessorConfig.size["height"],
-			)
-			# Map resample integer to PIL constant
-			resample_map = {
-				0: Image.NEAREST,
-				1: Image.LANCZOS,
-				2: Image.BILINEAR,
-				3: Image.BICUBIC,
-				4: Image.BOX,
-				5: Image.HAMMING,
-			}
-			resample_method = resample_map.get(self.preprocessorConfig.resample, Image.LANCZOS)
-			img = img.resize(target_size, resample_method)
-
-		# Convert to numpy array
-		imgArray = np.array(img).astype(np.float32)
-
-		# Rescale if configured (typically from [0, 255] to [0, 1])
-		if self.preprocessorConfig.do_rescale:
-			imgArray = imgArray * self.preprocessorConfig.rescale_factor
-
-		# Normalize if configured
-		if self.preprocessorConfig.do_normalize:
-			mean = np.array(self.preprocessorConfig.image_mean, dtype=np.float32)
-			std = np.array(self.preprocessorConfig.image_std, dtype=np.float32)
-			imgArray = (imgArray - mean) / std
+		targetSize = self._targetSize()
+		if targetSize is not None:
+			# Resample integers in preprocessor_config.json are PIL.Image.Resampling values
+			img = img.resize(targetSize, self.preprocessorConfig.resample)
+
+		return np.asarray(img, dtype=np.uint8)
+
+	def _resizePixels(self, rgb: np.ndarray) -> np.ndarray:
+		"""Resize an RGB pixel array to the model input size.
+
+		:param rgb: RGB uint8 array of shape (H, W, 3).
+		:return: Resized RGB uint8 array.
+		"""
+		targetSize = self._targetSize()
+		if targetSize is None or (rgb.shape[1], rgb.shape[0]) == targetSize:
+			return rgb
+		if cv2 is not None:
+			interpolation = _CV2_INTERPOLATION.get(self.preprocessorConfig.resample, cv2.INTER_AREA)
+			return cv2.resize(rgb, targetSize, interpolation=interpolation)
+		from PIL import Image
+
+		resized = Image.fromarray(rgb).resize(targetSize, self.preprocessorConfig.resample)
+		return np.asarray(resized, dtype=np.uint8)
+
+	def _preprocessImage(self, image: str | bytes | np.ndarray) -> np.ndarray:
+		"""Preprocess image for model input using external configuration.
+
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
+		:return: Preprocessed image array ready for model input.
+			The array is reused by the next call, so it must be consumed before preprocessing another image.
+		"""
+		rgb = None
+		if isinstance(image, np.ndarray):
+			rgb = self._resizePixels(image)
+		elif cv2 is not None:
+			rgb = self._loadImageWithOpenCV(image)
+		if rgb is None:
+			rgb = self._loadImageWithPillow(image)
 
 		# Adjust dimensions: (H, W, C) -> (1, C, H, W)
-		imgArray = np.transpose(imgArray, (2, 0, 1))
-		imgArray = np.expand_dims(imgArray, axis=0)
+		shape = (1, rgb.shape[2], rgb.shape[0], rgb.shape[1])
+		if self._pixelValues is None or self._pixelValues.shape != shape:
+			self._pixelValues = np.empty(shape, dtype=np.float32)
+		pixelValues = self._pixelValues
 
-		return imgArray
+		# Rescale and normalize straight into the contiguous model input buffer.
+		# Reading the uint8 pixels channel-first keeps every write sequential.
+		np.subtract(rgb.transpose(2, 0, 1), self._pixelOffset, out=pixelValues[0])
+		np.multiply(pixelValues, self._pixelScale, out=pixelValues)
+		return pixelValues
 
 	def _encodeImage(self, imageArray: np.ndarray) -> np.ndarray:
 		"""Encode image using ViT encoder.
@@ -226,35 +541,32 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 		:param imageArray: Preprocessed image array.
 		:return: Encoder hidden states.
 		"""
-		# Get encoder input name
-		inputName = self.encoderSession.get_inputs()[0].name
-
-		# Run encoder inference
-		imageArray = imageArray.astype(np.float32)
-		encoderOutputs = self.encoderSession.run(None, {inputName: imageArray})
+		# Run encoder inference, _preprocessImage already returns float32 so this doesn't copy
+		imageArray = imageArray.astype(np.float32, copy=False)
+		encoderOutputs = self.encoderSession.run(None, {self._encoderInputName: imageArray})
 
 		# Return last hidden state
 		return encoderOutputs[0]
 
-	def _decodeTokens(self, tokenIds: list[int]) -> str:
+	def _decodeTokens(self, tokenIds: list[int] | np.ndarray) -> str:
 		"""Decode token IDs to text.
 
-		:param tokenIds: List of token IDs.
+		:param tokenIds: List or array of token IDs.
 		:return: Decoded text string.
 		"""
-		tokens = []
-		for tokenId in tokenIds:
-			if tokenId in self.vocab:
-				token = self.vocab[tokenId]
-				if token not in ["<|endoftext|>", "<|pad|>"]:
-					tokens.append(token)
+		if isinstance(tokenIds, np.ndarray):
+			# Iterating Python ints is faster than indexing NumPy scalars
+			tokenIds = tokenIds.tolist()
+		vocab = self.vocab
+		vocabSize = self.vocabSize
+		tokens = [token for tokenId in tokenIds if 0 <= tokenId < vocabSize and (token := vocab[tokenId])]
 
 		# Simple text post-processing
 		# Ġ (Unicode U+0120) is used by GPT-2 and RoBERTa to indicate space at the beginning of a word in their vocabulary
 		text = " ".join(tokens).replace("Ġ", " ")
 
 		# Basic text cleaning
-		text = re.sub(r"\s+", " ", text)  # Merge multiple spaces
+		text = _WHITESPACE_RE.sub(" ", text)  # Merge multiple spaces
 		text = text.strip()
 
 		return text
@@ -273,25 +585,117 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 		"""
 		return [out.name for out in self.decoderSession.get_outputs()]
 
-	def _initializePastKeyValues(self, batchSize: int = 1) -> dict[str, np.ndarray]:
+	def _mapPastKeyValueOutputs(self) -> list[tuple[str, int]]:
+		"""Map each past_key_values input to the decoder output that feeds it on the next step.
+
+		Decoder outputs are ordered as logits followed by the key and value of each layer.
+
+		:return: List of (input name, output index) pairs.
+		"""
+		mapping = []
+		outputCount = len(self._decoderOutputNames)
+		for layerIdx in range(self.decoderConfig.n_layer):
+			# [1] -> layer0 key, [2] -> layer0 value, [3] -> layer1 key, ...
+			keyIndex = 1 + layerIdx * 2
+			valueIndex = keyIndex + 1
+			if valueIndex >= outputCount:
+				break
+			mapping.append((f"past_key_values.{layerIdx}.key", keyIndex))
+			mapping.append((f"past_key_values.{layerIdx}.value", valueIndex))
+		return mapping
+
+	def _allocateLogitsBuffer(self) -> np.ndarray | None:
+		"""Allocate a reusable buffer the decoder writes its logits into.
+
+		One token is fed per step, so the logits shape is (1, 1, vocab_size) for the whole sequence.
+
+		:return: Preallocated logits buffer, or None if the model's vocabulary size is not static.
+		"""
+		vocabSize = self.decoderSession.get_outputs()[0].shape[-1]
+		if not isinstance(vocabSize, int):
+			return None
+		return np.empty((1, 1, vocabSize), dtype=np.float32)
+
+	def _ensureKeyValueBuffers(self, maxLength: int) -> None:
+		"""Make sure the ping-pong key/value buffers can hold a sequence of ``maxLength`` tokens.
+
+		There are two banks with one buffer per present output. Each step writes its present key/values
+		into one bank, while the other bank, written by the previous step, is bound as the past.
+
+		:param maxLength: Maximum number of decoder steps.
+		"""
+		if maxLength <= self._keyValueBufferLength:
+			return
+		headDim = self.decoderConfig.n_embd // self.decoderConfig.n_head
+		bufferSize = self.decoderConfig.n_head * maxLength * headDim
+		bufferCount = len(self._pastKeyValueOutputs)
+		self._keyValueBuffers = [np.empty((bufferCount, bufferSize), dtype=np.float32) for _bank in range(2)]
+		# Raw addresses to bind, a (1, n_head, length, head_dim) tensor is a contiguous prefix of each row
+		self._keyValueBufferPointers = [
+			[bank.ctypes.data + index * bank.strides[0] for index in range(bufferCount)]
+			for bank in self._keyValueBuffers
+		]
+		self._keyValueBufferLength = maxLength
+
+	def _bindDecoderOutputs(
+		self,
+		ioBinding,
+		presentShape: tuple[int, int, int, int],
+		presentPointers: list[int],
+	) -> None:
+		"""Bind decoder outputs for the next step.
+
+		:param ioBinding: The decoder IOBinding.
+		:param presentShape: Shape of each present key/value output.
+		:param presentPointers: Addresses of the buffers the present key/values are written to.
+		"""
+		logitsName = self._decoderOutputNames[0]
+		if self._logitsBuffer is not None:
+			ioBinding.bind_output(
+				logitsName,
+				"cpu",
+				0,
+				np.float32,
+				self._logitsBuffer.shape,
+				self._logitsBuffer.ctypes.data,
+			)
+		else:
+			ioBinding.bind_output(logitsName, "cpu")
+		for (_pastName, outputIndex), pointer in zip(self._pastKeyValueOutputs, presentPointers):
+			ioBinding.bind_output(
+				self._decoderOutputNames[outputIndex],
+				"cpu",
+				0,
+				np.float32,
+				presentShape,
+				pointer,
+			)
+		for name in self._otherDecoderOutputNames:
+			ioBinding.bind_output(name, "cpu")
+
+	def _initializePastKeyValues(self, batchSize: int = 1) -> dict[str, "ort.OrtValue"]:
 		"""Initialize past_key_values for decoder.
 
+		The initial sequence length is 0, so every key and value is the same empty tensor and a single
+		OrtValue is shared by all layers.
+
 		:param batchSize: Batch size for inference.
 		:return: Dictionary of initialized past key values.
 		"""
-		pastKeyValues = {}
+		import onnxruntime as ort
+
+		# Key and value shape: (batch_size, num_heads, 0, head_dim)
+		headDim = self.decoderConfig.n_embd // self.decoderConfig.n_head
+		emptyPast = ort.OrtValue.ortvalue_from_shape_and_type(
+			(batchSize, self.decoderConfig.n_head, 0, headDim),
+			np.float32,
+		)
 
+		pastKeyValues = {}
 		# Create key and value for each layer
 		for layerIdx in range(self.decoderConfig.n_layer):
-			# Key and value shape: (batch_size, num_heads, 0, head_dim)
-			# Initial sequence length is 0
-			headDim = self.decoderConfig.n_embd // self.decoderConfig.n_head
-
-			keyShape = (batchSize, self.decoderConfig.n_head, 0, headDim)
-			valueShape = (batchSize, self.decoderConfig.n_head, 0, headDim)
-
-			pastKeyValues[f"past_key_values.{layerIdx}.key"] = np.zeros(keyShape, dtype=np.float32)
-			pastKeyValues[f"past_key_values.{layerIdx}.value"] = np.zeros(valueShape, dtype=np.float32)
+			pastKeyValues[f"past_key_values.{layerIdx}.key"] = emptyPast
+			pastKeyValues[f"past_key_values.{layerIdx}.value"] = emptyPast
 
 		return pastKeyValues
 
@@ -310,74 +714,150 @@ class VitGpt2ImageCaptioner(ImageCaptioner):
 		if maxLength is None:
 			maxLength = self.decoderConfig.max_length
 
-		# Initialize input sequence
-		inputIds = np.array([[self.modelConfig.bos_token_id]], dtype=np.int64)
-		generatedTokens = []
-
-		# Initialize past_key_values
-		pastKeyValues = self._initializePastKeyValues(batchSize=1)
-
-		for step in range(maxLength):
-			# Prepare decoder inputs
-			decoderInputs = {
-				"input_ids": inputIds if step == 0 else np.array([[generatedTokens[-1]]], dtype=np.int64),
-				"encoder_hidden_states": encoderHiddenStates,
-				"use_cache_branch": np.array([1], dtype=np.bool_),
-			}
-
-			# Add past_key_values to inputs
-			decoderInputs.update(pastKeyValues)
+		import onnxruntime as ort
 
-			# Run decoder
-			decoderOutputs = self.decoderSession.run(None, decoderInputs)
-			logits = decoderOutputs[0]  # Shape: (batch_size, seq_len, vocab_size)
+		# Avoid sequences that are too long
+		maxLength = max(0, min(maxLength, self.decoderConfig.n_ctx - 1))
 
-			# Greedy selection of next token
-			nextTokenLogits = logits[0, -1, :]  # Logits for last position
-			nextTokenId = int(np.argmax(nextTokenLogits))
+		# Initialize input sequence, generated tokens follow the BOS token
+		self._inputIds[0, 0] = self.modelConfig.bos_token_id
+		sequence = np.empty(maxLength + 1, dtype=np.int64)
+		sequence[0] = self.modelConfig.bos_token_id
+		tokenCount = 0
+		repetitionPenalty = self.generationConfig.repetition_penalty
 
-			# Check if generation should end
-			if nextTokenId == self.modelConfig.eos_token_id:
-				break
+		self._ensureKeyValueBuffers(maxLength)
+		nHead = self.decoderConfig.n_head
+		headDim = self.decoderConfig.n_embd // nHead
 
-			generatedTokens.append(nextTokenId)
+		ioBinding = self._decoderIoBinding
+		ioBinding.clear_binding_inputs()
+		ioBinding.clear_binding_outputs()
+		try:
+			# Inputs that stay the same for the whole sequence are bound only once
+			encoderHiddenStatesValue = ort.OrtValue.ortvalue_from_numpy(encoderHiddenStates)
+			ioBinding.bind_ortvalue_input("encoder_hidden_states", encoderHiddenStatesValue)
+			ioBinding.bind_ortvalue_input("use_cache_branch", self._useCacheBranchValue)
+			ioBinding.bind_ortvalue_input("input_ids", self._inputIdsValue)
+			for name, value in self._initialPastKeyValues.items():
+				ioBinding.bind_ortvalue_input(name, value)
+
+			for step in range(maxLength):
+				# Present key/values cover the whole sequence so far, including this step's token
+				presentShape = (1, nHead, step + 1, headDim)
+				presentPointers = self._keyValueBufferPointers[step % 2]
+				self._bindDecoderOutputs(ioBinding, presentShape, presentPointers)
+
+				# Run decoder
+				self.decoderSession.run_with_iobinding(ioBinding)
+				if self._logitsBuffer is not None:
+					logits = self._logitsBuffer
+				else:
+					logits = ioBinding.get_outputs()[0].numpy()  # Shape: (batch_size, seq_len, vocab_size)
+
+				nextTokenLogits = logits[0, -1]
+				if repetitionPenalty != 1.0:
+					# Penalize each token already in the sequence once, like transformers' RepetitionPenaltyLogitsProcessor
+					seenTokens = sequence[: tokenCount + 1]
+					scores = nextTokenLogits[seenTokens]
+					nextTokenLogits[seenTokens] = np.where(
+						scores < 0,
+						scores * repetitionPenalty,
+						scores / repetitionPenalty,
+					)
+
+				# Greedy selection of next token from the logits of the last position
+				nextTokenId = int(nextTokenLogits.argmax())
+
+				# Check if generation should end
+				if nextTokenId == self.modelConfig.eos_token_id:
+					break
+
+				tokenCount += 1
+				sequence[tokenCount] = nextTokenId
+				self._inputIds[0, 0] = nextTokenId
+
+				# The present key/values become the next step's past in place, the next step writes the other bank
+				for (pastName, _outputIndex), pointer in zip(self._pastKeyValueOutputs, presentPointers):
+					ioBinding.bind_input(pastName, "cpu", 0, np.float32, presentShape, pointer)
+		finally:
+			# Don't keep the KV cache alive between captions
+			ioBinding.clear_binding_inputs()
+			ioBinding.clear_binding_outputs()
 
-			# Update past_key_values from outputs
-			if len(decoderOutputs) > 1:
-				for layerIdx in range(self.decoderConfig.n_layer):
-					if len(decoderOutputs) > 1 + layerIdx * 2 + 1:
-						# [3] -> layer1 key, [4] -> layer1 value
-						keyIndex = 1 + layerIdx * 2
-						valueIndex = keyIndex + 1
-						pastKeyValues[f"past_key_values.{layerIdx}.key"] = decoderOutputs[keyIndex]
-						pastKeyValues[f"past_key_values.{layerIdx}.value"] = decoderOutputs[valueIndex]
+		# Decode generated text
+		return self._decodeTokens(sequence[1 : tokenCount + 1])
 
-			# Avoid sequences that are too long
-			if len(generatedTokens) >= self.decoderConfig.n_ctx - 1:
-				break
+	@staticmethod
+	def _captionCacheKey(image: str | bytes | np.ndarray, maxLength: int | None) -> tuple:
+		"""Build a hashable caption cache key for an image.
 
-		# Decode generated text
-		return self._decodeTokens(generatedTokens)
+		Pixel arrays are keyed by a digest, so cached screenshots don't keep their pixels alive.
+		"""
+		if isinstance(image, np.ndarray):
+			digest = hashlib.blake2b(np.ascontiguousarray(image), digest_size=16).digest()
+			return (image.shape, digest, maxLength)
+		return (image, maxLength)
 
-	@lru_cache()
-	def generateCaption(
+	def prepareImage(
 		self,
-		image: str | bytes,
+		image: str | bytes | np.ndarray,
 		maxLength: int | None = None,
-	) -> str:
-		"""Generate image caption.
+	) -> _PreparedImage:
+		"""Preprocess and encode an image.
 
-		:param image: Image file path or binary data.
+		This only uses the encoder session, so it can run while another caption is being decoded.
+
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
 		:param maxLength: Maximum generation length.
-		:return: Generated image caption.
+		:return: The encoded image, or its caption if already cached.
 		"""
+		cacheKey = self._captionCacheKey(image, maxLength)
+		with self._captionCacheLock:
+			caption = self._captionCache.get(cacheKey)
+			if caption is not None:
+				self._captionCache.move_to_end(cacheKey)
+		if caption is not None:
+			# Keep the caption itself, the entry may be evicted before the caption is requested
+			return _PreparedImage(cacheKey, maxLength, caption=caption)
+
 		# Preprocess image
 		imageArray = self._preprocessImage(image)
 
 		# Encode image
 		encoderHiddenStates = self._encodeImage(imageArray)
 
+		return _PreparedImage(cacheKey, maxLength, encoderHiddenStates)
+
+	def generateCaptionFromPrepared(self, prepared: _PreparedImage) -> str:
+		"""Generate the caption of an image returned by :meth:`prepareImage`.
+
+		:param prepared: The prepared image.
+		:return: Generated image caption.
+		"""
+		if prepared.caption is not None:
+			return prepared.caption
+
 		# Generate text
-		caption = self._generateWithGreedy(encoderHiddenStates, maxLength)
+		caption = self._generateWithGreedy(prepared.encoderHiddenStates, prepared.maxLength)
 
+		with self._captionCacheLock:
+			self._captionCache[prepared.cacheKey] = caption
+			if len(self._captionCache) > _CAPTION_CACHE_SIZE:
+				self._captionCache.popitem(last=False)
 		return caption
+
+	def generateCaption(
+		self,
+		image: str | bytes | np.ndarray,
+		maxLength: int | None = None,
+	) -> str:
+		"""Generate image caption.
+
+		Results are memoized per instance, so releasing the captioner frees the model.
+
+		:param image: Image file path, binary data, or RGB uint8 pixel array of shape (H, W, 3).
+		:param maxLength: Maximum generation length.
+		:return: Generated image caption.
+		"""
+		return self.generateCaptionFromPrepared(self.prepareImage(image, maxLength))
@@ -10,10 +10,12 @@ This module provides local image captioning functionality using ONNX models.
 It allows users to capture screen regions and generate captions using local AI models.
 """
 
-import io
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from threading import Thread
 import os
+from typing import TYPE_CHECKING
 
 import wx
 import config
@@ -23,6 +25,13 @@ import api
 
 from .captioner import ImageCaptioner
 from .captioner import imageCaptionerFactory
+from .captioner import ONNX_PRECISION_SUFFIXES, onnxVariantFileName
+
+if TYPE_CHECKING:
+	import numpy as np
+
+# Maximum number of captions in flight, including the one being generated
+_MAX_PENDING_CAPTIONS = 2
 
 try:
 	import addonHandler
@@ -30,48 +39,79 @@ try:
 except:
 	pass
 
-def _screenshotNavigator() -> bytes:
+def _screenshotNavigator() -> "np.ndarray":
 	"""Capture a screenshot of the current navigator object.
 
-	:Return: The captured image data as bytes in JPEG format.
+	:Return: The captured image as an RGB uint8 array of shape (height, width, 3).
 	"""
+	# Import late to avoid importing numpy at initialization
+	from .screenCapture import captureScreenRegion
+
 	# Get the currently focused object on screen
 	obj = api.getNavigatorObject()
 
 	# Get the object's position and size information
 	x, y, width, height = obj.location
 
-	# Create a bitmap with the same size as the object
-	bmp = wx.Bitmap(width, height)
+	# Read the screen region straight into a pixel array for the captioner
+	return captureScreenRegion(x, y, width, height)
 
-	# Create a memory device context for drawing operations on the bitmap
-	mem = wx.MemoryDC(bmp)
 
-	# Copy the specified screen region to the memory bitmap
-	mem.Blit(0, 0, width, height, wx.ScreenDC(), x, y)
+@lru_cache(maxsize=8)
+def _modelDirPath(modelsDir: str, currentModel: str) -> str:
+	"""Get the directory of a model, cached per models directory and model name.
 
-	# Convert the bitmap to an image object for more flexible operations
-	image = bmp.ConvertToImage()
+	:param modelsDir: Directory all models are downloaded to.
+	:param currentModel: Model name, e.g. ``Xenova/vit-gpt2-image-captioning``.
+	:return: Path of the model directory.
+	"""
+	return os.path.join(modelsDir, currentModel)
 
-	# Create a byte stream object to save image data as binary data
-	body = io.BytesIO()
 
-	# Save the image to the byte stream in JPEG format
-	image.SaveFile(body, wx.BITMAP_TYPE_JPEG)
+@lru_cache(maxsize=8)
+def _modelFilePaths(localModelDirPath: str, precision: str) -> tuple[str, str, str]:
+	"""Get the files a captioner loads from a model directory.
 
-	# Read the binary image data from the byte stream
-	imageData = body.getvalue()
-	return imageData
+	:param localModelDirPath: Path of the model directory.
+	:param precision: Precision of the ONNX weights, one of the keys of ``ONNX_PRECISION_SUFFIXES``.
+	:return: Tuple of (encoder path, decoder path, config path).
+	"""
+	return (
+		os.path.join(localModelDirPath, "onnx", onnxVariantFileName("encoder_model_quantized.onnx", precision)),
+		os.path.join(
+			localModelDirPath,
+			"onnx",
+			onnxVariantFileName("decoder_model_merged_quantized.onnx", precision),
+		),
+		os.path.join(localModelDirPath, "config.json"),
+	)
+
+
+def findInstalledPrecision(localModelDirPath: str, preferred: str) -> str | None:
+	"""Find the precision of the encoder and decoder downloaded for a model.
+
+	The precision setting applies to every model, while each model may have been downloaded with another one.
+
+	:param localModelDirPath: Path of the model directory.
+	:param preferred: Precision to use if its files exist.
+	:return: ``preferred`` if its files exist, otherwise the first other precision whose files exist,
+		or None if no variant of the encoder and decoder was downloaded.
+	"""
+	for precision in (preferred, *ONNX_PRECISION_SUFFIXES):
+		encoderPath, decoderPath, configPath = _modelFilePaths(localModelDirPath, precision)
+		if os.path.isfile(encoderPath) and os.path.isfile(decoderPath):
+			return precision
+	return None
 
 
-def _messageCaption(captioner: ImageCaptioner, imageData: bytes) -> None:
-	"""Generate a caption for the given image data.
+def _messageCaption(captioner: ImageCaptioner, preparedImage: Future) -> None:
+	"""Generate a caption for an image prepared by :meth:`ImageCaptioner.prepareImage`.
 
 	:param captioner: The captioner instance to use for generation.
-	:param imageData: The image data to caption.
+	:param preparedImage: Future resolving to the prepared image.
 	"""
 	try:
-		description = captioner.generateCaption(image=imageData)
+		description = captioner.generateCaptionFromPrepared(preparedImage.result())
 	except Exception:
 		# Translators: error message when an image description cannot be generated
 		wx.CallAfter(ui.message, _("Failed to generate description"))
@@ -83,7 +123,7 @@ def _messageCaption(captioner: ImageCaptioner, imageData: bytes) -> None:
 			# {description} will be replaced with the generated image description.
 			_("Could be: {description}").format(description=description),
 		)
-		wx.CallAfter(api.copyToClip(text=description, notify=False))
+		wx.CallAfter(api.copyToClip, text=description, notify=False)
 
 
 class ImageDescriber:
@@ -96,8 +136,14 @@ class ImageDescriber:
 	def __init__(self) -> None:
 		self.isModelLoaded = False
 		self.captioner: ImageCaptioner | None = None
-		self.captionThread: Thread | None = None
 		self.loadModelThread: Thread | None = None
+		# Images are prepared (preprocessed and encoded) on one worker while captions are generated on
+		# another, so a new screenshot is encoded while the previous caption is still being generated.
+		self._prepareExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PrepareCaptionImage")
+		self._captionExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="RunCaption")
+		self._isTerminated = False
+		self._pendingCaptions = 0
+		self._pendingCaptionsLock = threading.Lock()
 
 		enable = config.conf["captionLocal"]["loadModelWhenInit"]
 		# Load model when initializing
@@ -105,12 +151,12 @@ class ImageDescriber:
 			self.loadModelInBackground()
 
 	def terminate(self):
-		for t in [self.captionThread, self.loadModelThread]:
-			if t is not None and t.is_alive():
-				# We can't really join here if we are on the main thread and it might block
-				# but for an addon terminate it should be fine if it's not too long
-				pass
+		self._isTerminated = True
+		# Don't block the main thread waiting for a caption, just drop queued work
+		for executor in (self._prepareExecutor, self._captionExecutor):
+			executor.shutdown(wait=False, cancel_futures=True)
 		self.captioner = None
+		self.isModelLoaded = False
 
 	def runCaption(self, gesture=None) -> None:
 		"""Script to run image captioning on the current navigator object.
@@ -121,26 +167,59 @@ class ImageDescriber:
 
 	def _doCaption(self) -> None:
 		"""Real logic to run image captioning on the current navigator object."""
-		imageData = _screenshotNavigator()
+		if self._isTerminated:
+			return
+		# Reserve a pending slot before capturing, so a dropped request doesn't take a screenshot
+		with self._pendingCaptionsLock:
+			isBusy = self._pendingCaptions >= _MAX_PENDING_CAPTIONS
+			if not isBusy:
+				self._pendingCaptions += 1
+		if isBusy:
+			# Translators: Message when a caption is requested while earlier images are still being described
+			ui.message(_("still describing previous image"))
+			return
+
+		isSubmitted = False
+		try:
+			imageData = _screenshotNavigator()
 
-		if not self.isModelLoaded:
-			# In the addon, we might want to just load it or show a message
-			ui.message(_("loading model..."))
-			self._loadModel()
 			if not self.isModelLoaded:
+				# In the addon, we might want to just load it or show a message
+				ui.message(_("loading model..."))
+				self._loadModel()
+				if not self.isModelLoaded:
+					return
+
+			captioner = self.captioner
+			if captioner is None:
+				# The model was released or the plugin terminated while capturing
 				return
-
-		if self.captionThread is not None and self.captionThread.is_alive():
-			return
-
-		self.captionThread = threading.Thread(
-			target=_messageCaption,
-			args=(self.captioner, imageData),
-			name="RunCaptionThread",
-		)
-		# Translators: Message when starting image recognition
-		ui.message(_("getting image description..."))
-		self.captionThread.start()
+			try:
+				preparedImage = self._prepareExecutor.submit(captioner.prepareImage, imageData)
+				self._captionExecutor.submit(self._runCaption, captioner, preparedImage)
+			except RuntimeError:
+				# The executors were shut down by terminate()
+				log.debug("Caption requested while terminating, ignoring it")
+				return
+			isSubmitted = True
+			# Translators: Message when starting image recognition
+			ui.message(_("getting image description..."))
+		finally:
+			if not isSubmitted:
+				with self._pendingCaptionsLock:
+					self._pendingCaptions -= 1
+
+	def _runCaption(self, captioner: ImageCaptioner, preparedImage: Future) -> None:
+		"""Generate and report a caption, then free its pending slot.
+
+		:param captioner: The captioner instance to use for generation.
+		:param preparedImage: Future resolving to the prepared image.
+		"""
+		try:
+			_messageCaption(captioner, preparedImage)
+		finally:
+			with self._pendingCaptionsLock:
+				self._pendingCaptions -= 1
 
 	def _loadModel(self, localModelDirPath: str | None = None) -> None:
 		"""Load the ONNX model for image captioning.
@@ -148,14 +227,16 @@ class ImageDescriber:
 		:param localModelDirPath: path of model directory
 		"""
 
+		captionLocalConf = config.conf["captionLocal"]
 		if not localModelDirPath:
-			modelsDir = config.conf["captionLocal"]["modelsDir"]
-			currentModel = config.conf["captionLocal"]["currentModel"]
-			localModelDirPath = os.path.join(modelsDir, currentModel)
-		
-		encoderPath = os.path.join(localModelDirPath, "onnx", "encoder_model_quantized.onnx")
-		decoderPath = os.path.join(localModelDirPath, "onnx", "decoder_model_merged_quantized.onnx")
-		configPath = os.path.join(localModelDirPath, "config.json")
+			localModelDirPath = _modelDirPath(captionLocalConf["modelsDir"], captionLocalConf["currentModel"])
+
+		precision = captionLocalConf["modelPrecision"]
+		installedPrecision = findInstalledPrecision(localModelDirPath, precision)
+		if installedPrecision is not None and installedPrecision != precision:
+			log.debugWarning(f"No {precision} files in {localModelDirPath}, loading the {installedPrecision} ones")
+			precision = installedPrecision
+		encoderPath, decoderPath, configPath = _modelFilePaths(localModelDirPath, precision)
 
 		try:
 			from . import modelConfig
@@ -171,7 +171,7 @@ class _PreprocessorConfig:
 	image_processor_type: str = "ViTFeatureExtractor"
 	image_mean: list[float] | None = None
 	image_std: list[float] | None = None
-	resample: int = 2  # PIL.Image.LANCZOS
+	resample: int = 2  # PIL.Image.BILINEAR
 	rescale_factor: float = 0.00392156862745098  # 1/255
 	size: dict[str, int] | None = None
 
@@ -8,9 +8,13 @@
 Multi‑threaded model downloader
 """
 
+import hashlib
 import os
+import random
+import re
 import threading
 import time
+from email.utils import parsedate_to_datetime
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, List, Tuple, Optional, Set
@@ -28,9 +32,71 @@ import config
 ProgressCallback = Callable[[str, int, int, float], None]
 
 # Constants
-CHUNK_SIZE: int = 8_192
+# Large chunks keep the per-chunk Python overhead negligible, so fast links are network bound
+CHUNK_SIZE: int = 1 << 20  # 1 MiB
 MAX_RETRIES: int = 3
 BACKOFF_BASE: int = 2  # Base delay (in seconds) for exponential backoff strategy
+BACKOFF_CAP: int = 30  # Maximum delay (in seconds) between retries
+# Longest Retry-After delay (in seconds) honored, so a server can't stall the download indefinitely
+RETRY_AFTER_CAP: int = 60
+# Files at least this large are fetched over several connections, in byte ranges of RANGE_PART_SIZE
+PARALLEL_DOWNLOAD_THRESHOLD: int = 16 << 20  # 16 MiB
+RANGE_CONNECTIONS_PER_FILE: int = 4
+# Small parts let connections that finish early take over remaining work, and limit what a failed part refetches
+RANGE_PART_SIZE: int = 8 << 20  # 8 MiB
+# Suffix of files being downloaded, renamed to the final name once complete
+PART_SUFFIX: str = ".part"
+# Ranged downloads preallocate the whole file, so they must never be mistaken for a resumable part
+RANGED_PART_SUFFIX: str = ".ranged.part"
+# Suffix of the sidecar file listing the ranges of a ranged download that are complete, one "start-end" per line
+RANGES_SUFFIX: str = ".ranges"
+# Progress is reported at least every PROGRESS_REPORT_BYTES or every percent of a file
+PROGRESS_REPORT_BYTES: int = 1 << 20  # 1 MiB
+# Interval (in seconds) at which progress of concurrent downloads is forwarded to the callback
+PROGRESS_INTERVAL: float = 0.1
+# Hugging Face uses the SHA-256 of LFS files as their ETag
+_SHA256_ETAG_RE = re.compile(r'^(?:W/)?"?([0-9a-f]{64})"?$')
+# Suffix of the sidecar file storing the ETag of the downloaded version of a file
+ETAG_SUFFIX: str = ".etag"
+
+
+class _ProgressCoalescer:
+	"""Forward download progress to a callback, keeping only the latest update of each file.
+
+	Workers may report progress at any rate; a single thread forwards it every ``PROGRESS_INTERVAL`` seconds,
+	so a GUI callback isn't flooded with cross-thread calls as more files download concurrently.
+	"""
+
+	def __init__(self, callback: ProgressCallback):
+		self._callback = callback
+		self._latest: dict[str, Tuple[int, int, float]] = {}
+		self._lock = threading.Lock()
+		self._stopped = threading.Event()
+		self._thread = threading.Thread(target=self._run, name="DownloadProgress", daemon=True)
+		self._thread.start()
+
+	def __call__(self, fileName: str, downloaded: int, total: int, percent: float) -> None:
+		with self._lock:
+			self._latest[fileName] = (downloaded, total, percent)
+
+	def _flush(self) -> None:
+		with self._lock:
+			latest, self._latest = self._latest, {}
+		for fileName, (downloaded, total, percent) in latest.items():
+			try:
+				self._callback(fileName, downloaded, total, percent)
+			except Exception:
+				log.exception("Error in download progress callback")
+
+	def _run(self) -> None:
+		while not self._stopped.wait(PROGRESS_INTERVAL):
+			self._flush()
+
+	def close(self) -> None:
+		"""Stop forwarding periodically and deliver the last pending updates."""
+		self._stopped.set()
+		self._thread.join()
+		self._flush()
 
 
 class ModelDownloader:
@@ -46,11 +112,17 @@ class ModelDownloader:
 		Initialize the ModelDownloader.
 		"""
 		self.remoteHost = remoteHost
+		# Scheme and host every download URL starts with, normalized once rather than for every file
+		if remoteHost.startswith(("http://", "https://")):
+			self._baseUrl = remoteHost.rstrip("/")
+		else:
+			self._baseUrl = f"https://{remoteHost}".rstrip("/")
 		self.maxWorkers = maxWorkers
 		self.maxRetries = maxRetries
 
 		# Thread control
-		self.cancelRequested = False
+		# An event rather than a flag, so waits between retries end as soon as cancellation is requested
+		self._cancelEvent = threading.Event()
 		self.downloadLock = threading.Lock()
 		self.activeFutures: Set = set()
 
@@ -65,13 +137,24 @@ class ModelDownloader:
 			allowed_methods=["HEAD", "GET", "OPTIONS"],
 		)
 
-		adapter = HTTPAdapter(max_retries=retryStrategy)
+		# Keep a pooled keep-alive connection for every concurrent request (files times byte ranges),
+		# so each TLS handshake is reused across files instead of the connection being discarded.
+		adapter = HTTPAdapter(
+			max_retries=retryStrategy,
+			pool_maxsize=maxWorkers * RANGE_CONNECTIONS_PER_FILE,
+		)
 		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+
+	@property
+	def cancelRequested(self) -> bool:
+		"""Whether cancellation of the active downloads was requested."""
+		return self._cancelEvent.is_set()
 
 	def requestCancel(self) -> None:
 		"""Request cancellation of all active downloads."""
 		log.debug("Cancellation requested")
-		self.cancelRequested = True
+		self._cancelEvent.set()
 
 		# Cancel all active futures
 		with self.downloadLock:
@@ -83,7 +166,7 @@ class ModelDownloader:
 	def resetCancellation(self) -> None:
 		"""Reset cancellation state for new download session."""
 		with self.downloadLock:
-			self.cancelRequested = False
+			self._cancelEvent.clear()
 			self.activeFutures.clear()
 
 	def ensureModelsDirectory(self, defaultPath: str) -> str:
@@ -109,34 +192,55 @@ class ModelDownloader:
 		"""
 		Construct a full download URL for *Hugging Face‑style* repositories.
 		"""
-		remoteHost = self.remoteHost
-		if not remoteHost.startswith(("http://", "https://")):
-			remoteHost = f"https://{remoteHost}"
-
-		base = remoteHost.rstrip("/")
 		model = modelName.strip("/")
 		ref = resolvePath.strip("/")
 		filePath = filePath.lstrip("/")
 
-		return f"{base}/{model}/{ref}/{filePath}"
+		return f"{self._baseUrl}/{model}/{ref}/{filePath}"
 
-	def _getRemoteFileSize(self, url: str) -> int:
+	@staticmethod
+	def _getETag(response: Response) -> str:
 		"""
-		Get remote file size using HEAD request.
+		Get the ETag identifying the version of a remote file.
+
+		Hugging Face serves LFS files through a redirect carrying ``X-Linked-Etag``,
+		the ETag of the final response then belongs to the storage backend and is only used as a fallback.
+		"""
+		for resp in (*response.history, response):
+			linkedETag = resp.headers.get("X-Linked-Etag")
+			if linkedETag:
+				return linkedETag
+		return response.headers.get("ETag", "")
+
+	def _getRemoteFileInfo(self, url: str) -> Tuple[int, bool, str]:
+		"""
+		Get remote file size using HEAD request, whether the server accepts byte range requests,
+		and the ETag of the file (empty if unknown).
+
+		:raises FileNotFoundError: If the server reports that the file doesn't exist or can't be accessed.
 		"""
 		if self.cancelRequested:
-			return 0
+			return 0, False, ""
 
 		try:
 			response = self.session.head(url, timeout=10, allow_redirects=True)
 			response.raise_for_status()
+		except requests.exceptions.HTTPError as e:
+			if e.response is not None and e.response.status_code in (401, 403, 404):
+				raise FileNotFoundError(f"{url} is not available (HTTP {e.response.status_code})") from e
+			if not self.cancelRequested:
+				log.warning(f"Failed to get remote file size (HEAD) for {url}: {e}")
 		except Exception as e:
 			if not self.cancelRequested:
 				log.warning(f"Failed to get remote file size (HEAD) for {url}: {e}")
 		else:
 			contentLength = response.headers.get("Content-Length")
 			if contentLength:
-				return int(contentLength)
+				return (
+					int(contentLength),
+					response.headers.get("Accept-Ranges", "").lower() == "bytes",
+					self._getETag(response),
+				)
 
 		try:
 			response = self.session.get(url, headers={"Range": "bytes=0-0"}, timeout=10, allow_redirects=True)
@@ -147,9 +251,39 @@ class ModelDownloader:
 			if response.status_code == 206:  # Partial content
 				contentRange = response.headers.get("Content-Range", "")
 				if contentRange and "/" in contentRange:
-					return int(contentRange.split("/")[-1])
+					return int(contentRange.split("/")[-1]), True, self._getETag(response)
+
+		return 0, False, ""
 
-		return 0
+	@staticmethod
+	def _getExpectedSha256(etag: str) -> str:
+		"""
+		Get the SHA-256 a file must have from its ETag.
+
+		:return: Lowercase hex digest, or an empty string if the ETag isn't a SHA-256 (e.g. for non-LFS files).
+		"""
+		match = _SHA256_ETAG_RE.match(etag)
+		return match.group(1) if match else ""
+
+	@staticmethod
+	def _readStoredETag(localPath: str) -> str:
+		"""Read the ETag stored next to a downloaded file, empty if there is none."""
+		try:
+			with open(f"{localPath}{ETAG_SUFFIX}", "r", encoding="utf-8") as fh:
+				return fh.read().strip()
+		except OSError:
+			return ""
+
+	@staticmethod
+	def _storeETag(localPath: str, etag: str) -> None:
+		"""Store the ETag of a downloaded file next to it."""
+		if not etag:
+			return
+		try:
+			with open(f"{localPath}{ETAG_SUFFIX}", "w", encoding="utf-8") as fh:
+				fh.write(etag)
+		except OSError as err:
+			log.debugWarning(f"Failed to store ETag of {localPath}: {err}")
 
 	def _reportProgress(
 		self,
@@ -165,14 +299,10 @@ class ModelDownloader:
 		if not callback or total == 0 or self.cancelRequested:
 			return lastReported
 
-		percent = downloaded / total * 100
-
-		if (
-			downloaded - lastReported >= 1_048_576  # 1 MiB
-			or abs(percent - lastReported / total * 100) >= 1.0
-			or downloaded == total
-		):
-			callback(fileName, downloaded, total, percent)
+		# Report every MiB or every percent, whichever comes first, using integer arithmetic only
+		sinceReported = downloaded - lastReported
+		if sinceReported >= PROGRESS_REPORT_BYTES or sinceReported * 100 >= total or downloaded == total:
+			callback(fileName, downloaded, total, downloaded * 100 / total)
 			return downloaded
 
 		return lastReported
@@ -182,9 +312,17 @@ class ModelDownloader:
 		url: str,
 		localPath: str,
 		progressCallback: ProgressCallback | None = None,
+		remoteInfo: Tuple[int, bool, str] | None = None,
+		forceDownload: bool = False,
+		resumePartial: bool = True,
 	) -> Tuple[bool, str]:
 		"""
 		Download a single file with resume support.
+
+		:param remoteInfo: Result of :meth:`_getRemoteFileInfo` if already known, otherwise it is requested here.
+		:param forceDownload: Download the file from scratch even if a complete or partial copy exists.
+			A complete copy is only replaced once the new download succeeds.
+		:param resumePartial: Resume an incomplete earlier download, rather than discarding it and starting over.
 		"""
 		if self.cancelRequested:
 			return False, "Download cancelled"
@@ -197,25 +335,301 @@ class ModelDownloader:
 		if not success:
 			return False, message
 
-		# Get remote file size
-		remoteSize = self._getRemoteFileSize(url)
+		# Get remote file size and version
+		if remoteInfo is None:
+			try:
+				remoteInfo = self._getRemoteFileInfo(url)
+			except FileNotFoundError as e:
+				return False, str(e)
+		remoteSize, acceptsRanges, remoteETag = remoteInfo
 
 		if self.cancelRequested:
 			return False, "Download cancelled"
 
-		# Check if file already exists and is complete
-		success, message = self._checkExistingFile(
-			localPath,
-			remoteSize,
-			fileName,
-			progressCallback,
-			threadId,
-		)
-		if success is not None:
-			return success, message
+		partPath = f"{localPath}{PART_SUFFIX}"
+		if forceDownload:
+			# Keep the current file until its replacement is complete, it is only replaced on success.
+			# Its stored ETag is kept too, so a failed download doesn't mark the current file as the new version.
+			self._discardPartialDownloads(localPath)
+		else:
+			# Check if file already exists and is complete
+			success, message = self._checkExistingFile(
+				localPath,
+				remoteSize,
+				remoteETag,
+				fileName,
+				progressCallback,
+				threadId,
+			)
+			if success is not None:
+				if success:
+					self._storeETag(localPath, remoteETag)
+				return success, message
+
+			if not resumePartial:
+				self._discardLocalFile(localPath)
+			elif os.path.exists(localPath) and not os.path.exists(partPath):
+				# Resume an incomplete file downloaded in place by an earlier version
+				try:
+					os.replace(localPath, partPath)
+				except OSError as err:
+					return False, f"Failed to move {localPath} to {partPath}: {err}"
+
+			# Store the version being downloaded first, so resuming a partial download is checked against it
+			self._storeETag(localPath, remoteETag)
+
+		success, message = None, ""
+		# Split large files over several connections, unless a partial file can be resumed instead
+		if (
+			acceptsRanges
+			and remoteSize >= PARALLEL_DOWNLOAD_THRESHOLD
+			and not os.path.exists(partPath)
+		):
+			success, message = self._downloadInRanges(
+				url,
+				localPath,
+				fileName,
+				remoteSize,
+				remoteETag,
+				progressCallback,
+			)
+			if success is None:
+				log.debug(f"Server ignored range requests for {url}, downloading in a single stream")
+		else:
+			# A ranged download left by an earlier run can't be continued in a single stream
+			self._discardRangedDownload(localPath)
 
 		# Attempt download with retries
-		return self._downloadWithRetries(url, localPath, fileName, threadId, progressCallback)
+		if success is None:
+			success, message = self._downloadWithRetries(url, localPath, fileName, threadId, progressCallback)
+		if success:
+			self._storeETag(localPath, remoteETag)
+		return success, message
+
+	def _downloadInRanges(
+		self,
+		url: str,
+		localPath: str,
+		fileName: str,
+		total: int,
+		remoteETag: str,
+		progressCallback: ProgressCallback | None,
+	) -> Tuple[Optional[bool], str]:
+		"""
+		Download a large file over several connections, each fetching one byte range.
+
+		Ranges are written into a preallocated ``.ranged.part`` file that replaces the destination once complete,
+		so an interrupted download never looks like a complete file.
+		Completed ranges are recorded in a ``.ranges`` sidecar, so an interrupted download resumes
+		by fetching only the missing ones.
+		Ranges arrive out of order, so the file is hashed once complete when its ETag is a SHA-256.
+
+		:return: Success flag and message, or None as the flag if the server ignored the range requests
+			and the file should be downloaded in a single stream instead.
+		"""
+		partPath = f"{localPath}{RANGED_PART_SUFFIX}"
+		rangesPath = f"{localPath}{RANGES_SUFFIX}"
+		ranges = [(start, min(start + RANGE_PART_SIZE, total) - 1) for start in range(0, total, RANGE_PART_SIZE)]
+
+		completedRanges = self._readCompletedRanges(partPath, rangesPath, total)
+		if completedRanges:
+			log.debug(f"Resuming {fileName}, {len(completedRanges)} of {len(ranges)} ranges already downloaded")
+		else:
+			try:
+				with open(partPath, "wb") as fh:
+					fh.truncate(total)
+				with open(rangesPath, "w", encoding="utf-8"):
+					pass
+			except OSError as err:
+				return False, f"Failed to create {partPath}: {err}"
+
+		progressLock = threading.Lock()
+		downloaded = sum(end - start + 1 for start, end in ranges if (start, end) in completedRanges)
+		lastReported = downloaded
+
+		def onChunk(size: int) -> None:
+			nonlocal downloaded, lastReported
+			with progressLock:
+				downloaded += size
+				lastReported = self._reportProgress(progressCallback, fileName, downloaded, total, lastReported)
+
+		# Once a part fails, or the server turns out to ignore ranges, the remaining parts are skipped
+		stopEvent = threading.Event()
+
+		def downloadPart(byteRange: Tuple[int, int]) -> Tuple[Optional[bool], str]:
+			if byteRange in completedRanges:
+				return True, ""
+			if stopEvent.is_set():
+				return False, ""
+			result = self._downloadRange(url, partPath, byteRange[0], byteRange[1], onChunk)
+			if result[0]:
+				with progressLock:
+					self._recordCompletedRange(rangesPath, byteRange)
+			else:
+				stopEvent.set()
+			return result
+
+		connections = min(RANGE_CONNECTIONS_PER_FILE, len(ranges))
+		with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="DownloadRange") as executor:
+			results = list(executor.map(downloadPart, ranges))
+
+		if any(rangeSuccess is None for rangeSuccess, rangeMessage in results):
+			success, message = None, ""
+		else:
+			failures = [rangeMessage for rangeSuccess, rangeMessage in results if not rangeSuccess and rangeMessage]
+			if failures:
+				success, message = False, failures[0]
+			else:
+				success, message = True, "Download completed"
+
+		if success:
+			# Make the data durable before the file is renamed into place
+			try:
+				with open(partPath, "r+b") as fh:
+					os.fsync(fh.fileno())
+			except OSError as err:
+				success, message = False, f"Failed to flush {partPath}: {err}"
+
+		expectedSha256 = self._getExpectedSha256(remoteETag)
+		if success and expectedSha256:
+			try:
+				with open(partPath, "rb") as fh:
+					actualSha256 = hashlib.file_digest(fh, "sha256").hexdigest()
+			except OSError as err:
+				success, message = False, f"Failed to verify {partPath}: {err}"
+			else:
+				if actualSha256 != expectedSha256:
+					# Which range is corrupt is unknown, so start over on the next attempt
+					self._discardRangedDownload(localPath)
+					return False, f"Checksum mismatch for {fileName}"
+
+		if success is None:
+			# The single stream download that follows can't use the ranges fetched so far
+			self._discardRangedDownload(localPath)
+			return success, message
+		if success:
+			try:
+				os.replace(partPath, localPath)
+			except OSError as err:
+				success, message = False, f"Failed to move {partPath} to {localPath}: {err}"
+		if not success:
+			# Keep the ranges downloaded so far, the next attempt only fetches the missing ones
+			return success, message
+		try:
+			os.remove(rangesPath)
+		except OSError:
+			pass
+
+		if progressCallback and not self.cancelRequested:
+			progressCallback(fileName, total, total, 100.0)
+		return True, message
+
+	@staticmethod
+	def _readCompletedRanges(partPath: str, rangesPath: str, total: int) -> Set[Tuple[int, int]]:
+		"""
+		Read the ranges an interrupted ranged download completed.
+
+		:return: The ``(start, end)`` pairs recorded as complete, empty if the download can't be resumed
+			because either file is missing or the partial file doesn't have the expected size.
+		"""
+		try:
+			if os.stat(partPath).st_size != total:
+				return set()
+			with open(rangesPath, "r", encoding="utf-8") as fh:
+				lines = fh.read().split()
+		except OSError:
+			return set()
+		completedRanges = set()
+		for line in lines:
+			start, separator, end = line.partition("-")
+			if separator and start.isdigit() and end.isdigit():
+				completedRanges.add((int(start), int(end)))
+		return completedRanges
+
+	@staticmethod
+	def _recordCompletedRange(rangesPath: str, byteRange: Tuple[int, int]) -> None:
+		"""Append a completed range to the sidecar of a ranged download."""
+		try:
+			with open(rangesPath, "a", encoding="utf-8") as fh:
+				fh.write(f"{byteRange[0]}-{byteRange[1]}\n")
+		except OSError as err:
+			# The range is only fetched again if the download is interrupted
+			log.debugWarning(f"Failed to record completed range in {rangesPath}: {err}")
+
+	@classmethod
+	def _discardPartialDownloads(cls, localPath: str) -> None:
+		"""Remove the partial downloads of a file, keeping the file itself."""
+		cls._removeFiles(f"{localPath}{PART_SUFFIX}")
+		cls._discardRangedDownload(localPath)
+
+	@classmethod
+	def _discardRangedDownload(cls, localPath: str) -> None:
+		"""Remove the partial file of a ranged download along with its completed ranges."""
+		cls._removeFiles(f"{localPath}{RANGED_PART_SUFFIX}", f"{localPath}{RANGES_SUFFIX}")
+
+	def _downloadRange(
+		self,
+		url: str,
+		partPath: str,
+		start: int,
+		end: int,
+		onChunk: Callable[[int], None],
+	) -> Tuple[Optional[bool], str]:
+		"""
+		Download bytes ``start`` to ``end`` (inclusive) of a file into the same range of ``partPath``.
+
+		An interrupted range is retried from the last byte written.
+
+		:return: Success flag and message, or None as the flag if the server ignored the range request.
+		"""
+		threadId = threading.current_thread().ident or 0
+		position = start
+		message = ""
+		for attempt in range(self.maxRetries):
+			retryAfter = None
+			if self.cancelRequested:
+				return False, "Download cancelled"
+
+			try:
+				with self.session.get(
+					url,
+					headers={"Range": f"bytes={position}-{end}"},
+					stream=True,
+					timeout=10,
+					allow_redirects=True,
+				) as response:
+					response.raise_for_status()
+					if response.status_code != 206:
+						return None, ""
+
+					# Each range writes through its own handle, so ranges never share a file position
+					with open(partPath, "r+b") as fh:
+						fh.seek(position)
+						for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+							if self.cancelRequested:
+								return False, "Download cancelled"
+							if chunk:
+								fh.write(chunk)
+								position += len(chunk)
+								onChunk(len(chunk))
+
+				if position > end:
+					return True, ""
+				message = f"Connection closed at byte {position} of range {start}-{end}"
+
+			except RequestException as e:
+				if self.cancelRequested:
+					return False, "Download cancelled"
+				message = f"Request error: {str(e)}"
+				retryAfter = self._getRetryAfter(e.response)
+
+			except OSError as e:
+				return False, f"Failed to write {partPath}: {e}"
+
+			if attempt < self.maxRetries - 1 and not self._waitForRetry(attempt, threadId, retryAfter):
+				return False, "Download cancelled"
+
+		return False, message
 
 	def _createDestinationDirectory(self, localPath: str) -> Tuple[bool, str]:
 		"""Create destination directory if it doesn't exist."""
@@ -225,19 +639,54 @@ class ModelDownloader:
 		except OSError as err:
 			return False, f"Failed to create directory {localPath}: {err}"
 
+	@staticmethod
+	def _removeFiles(*paths: str) -> None:
+		"""Remove files, ignoring those that don't exist."""
+		for path in paths:
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+			except OSError as err:
+				log.debugWarning(f"Failed to remove {path}: {err}")
+
+	@classmethod
+	def _discardLocalFile(cls, localPath: str) -> None:
+		"""Remove a downloaded file along with its partial downloads and stored ETag."""
+		cls._removeFiles(
+			localPath,
+			f"{localPath}{PART_SUFFIX}",
+			f"{localPath}{RANGED_PART_SUFFIX}",
+			f"{localPath}{RANGES_SUFFIX}",
+			f"{localPath}{ETAG_SUFFIX}",
+		)
+
 	def _checkExistingFile(
 		self,
 		localPath: str,
 		remoteSize: int,
+		remoteETag: str,
 		fileName: str,
 		progressCallback: ProgressCallback | None,
 		threadId: int,
 	) -> Tuple[Optional[bool], str]:
-		"""Check if file already exists and is complete."""
-		if not os.path.exists(localPath):
+		"""Check if file already exists and is complete.
+
+		The stored ETag describes both a downloaded file and any partial download of it.
+		If it differs from the remote one, the file and its partial downloads are outdated and removed,
+		so the file is downloaded again instead of being skipped or resumed from bytes of the old version.
+		Files without a stored ETag are checked by size only.
+		"""
+		storedETag = self._readStoredETag(localPath) if remoteETag else ""
+		if storedETag and storedETag != remoteETag:
+			log.debug(f"{fileName} changed on the server, downloading it again")
+			self._discardLocalFile(localPath)
 			return None, ""
 
-		localSize = os.path.getsize(localPath)
+		try:
+			localSize = os.stat(localPath).st_size
+		except FileNotFoundError:
+			return None, ""
 
 		if remoteSize > 0:
 			if localSize == remoteSize:
@@ -270,6 +719,7 @@ class ModelDownloader:
 			if self.cancelRequested:
 				return False, "Download cancelled"
 
+			retryAfter = None
 			try:
 				success, message = self._performSingleDownload(
 					url,
@@ -283,6 +733,7 @@ class ModelDownloader:
 				message = self._handleHttpError(e, localPath, fileName, progressCallback, threadId)
 				if message.startswith("Download completed"):
 					return True, message
+				retryAfter = self._getRetryAfter(e.response)
 
 			except RequestException as e:
 				if self.cancelRequested:
@@ -301,7 +752,7 @@ class ModelDownloader:
 
 			if not self.cancelRequested:
 				if attempt < self.maxRetries - 1:
-					success = self._waitForRetry(attempt, threadId)
+					success = self._waitForRetry(attempt, threadId, retryAfter)
 					if not success:
 						return False, "Download cancelled"
 				else:
@@ -317,10 +768,16 @@ class ModelDownloader:
 		threadId: int,
 		progressCallback: ProgressCallback | None,
 	) -> Tuple[bool, str]:
-		"""Perform a single download attempt with resume support."""
-		resumePos = 0
-		if os.path.exists(localPath):
-			resumePos = os.path.getsize(localPath)
+		"""Perform a single download attempt with resume support.
+
+		Data is appended to ``<localPath>.part``, which is renamed to ``localPath`` once complete,
+		so a failed attempt or a later retry resumes where the previous one stopped.
+		"""
+		partPath = f"{localPath}{PART_SUFFIX}"
+		try:
+			resumePos = os.stat(partPath).st_size
+		except FileNotFoundError:
+			resumePos = 0
 
 		# Set up headers for resume
 		headers = {}
@@ -336,28 +793,16 @@ class ModelDownloader:
 			allow_redirects=True,
 		)
 
-		# Check if resume is supported
-		if resumePos > 0 and response.status_code != 206:
-			if os.path.exists(localPath):
-				try:
-					os.remove(localPath)
-				except OSError:
-					pass
+		try:
+			response.raise_for_status()
 
 			if self.cancelRequested:
-				response.close()
-				raise Exception("Download cancelled")
-
-			response.close()
-			response = self.session.get(url, stream=True, timeout=10, allow_redirects=True)
+				return False, "Download cancelled"
 
-		response.raise_for_status()
+			# A full response to a resume request means the server can't resume, start over with its body
+			if resumePos > 0 and response.status_code != 206:
+				resumePos = 0
 
-		if self.cancelRequested:
-			response.close()
-			return False, "Download cancelled"
-
-		try:
 			# Determine total file size
 			if response.status_code == 206:
 				contentRange = response.headers.get("Content-Range", "")
@@ -368,17 +813,29 @@ class ModelDownloader:
 			else:
 				total = int(response.headers.get("Content-Length", "0"))
 
+			# Hash while writing when the ETag is a SHA-256, starting with the bytes already downloaded
+			expectedSha256 = self._getExpectedSha256(self._getETag(response))
+			hasher = None
+			if expectedSha256:
+				if resumePos > 0:
+					with open(partPath, "rb") as fh:
+						hasher = hashlib.file_digest(fh, "sha256")
+				else:
+					hasher = hashlib.sha256()
+
 			downloaded = resumePos
 			lastReported = downloaded
 			mode = "ab" if resumePos > 0 else "wb"
 
-			with open(localPath, mode) as fh:
+			with open(partPath, mode) as fh:
 				for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
 					if self.cancelRequested:
 						return False, "Download cancelled"
 
 					if chunk:
 						fh.write(chunk)
+						if hasher is not None:
+							hasher.update(chunk)
 						downloaded += len(chunk)
 
 						if total > 0:
@@ -390,12 +847,23 @@ class ModelDownloader:
 								lastReported,
 							)
 
+				# Make the data durable before the file is renamed into place,
+				# so a crash right after the rename can't leave a truncated model behind
+				fh.flush()
+				os.fsync(fh.fileno())
+
 			# Verify
-			actualSize = os.path.getsize(localPath)
+			actualSize = os.path.getsize(partPath)
 			if actualSize == 0:
 				return False, "Downloaded file is empty"
 			if total > 0 and actualSize != total:
 				return False, f"File incomplete: {actualSize}/{total} bytes"
+			if hasher is not None and hasher.hexdigest() != expectedSha256:
+				# Corrupt data can't be resumed, start over on the next attempt
+				os.remove(partPath)
+				return False, f"Checksum mismatch for {fileName}"
+
+			os.replace(partPath, localPath)
 
 			if progressCallback and not self.cancelRequested:
 				progressCallback(fileName, actualSize, max(total, actualSize), 100.0)
@@ -415,22 +883,60 @@ class ModelDownloader:
 	) -> str:
 		"""Handle HTTP errors."""
 		if error.response is not None and error.response.status_code == 416:  # Range Not Satisfiable
-			if os.path.exists(localPath):
-				actualSize = os.path.getsize(localPath)
-				if actualSize > 0:
-					if progressCallback and not self.cancelRequested:
-						progressCallback(fileName, actualSize, actualSize, 100.0)
-					return "Download completed"
+			# The partial file already holds every byte, it only missed being renamed
+			partPath = f"{localPath}{PART_SUFFIX}"
+			try:
+				actualSize = os.stat(partPath).st_size
+			except FileNotFoundError:
+				actualSize = 0
+			if actualSize > 0:
+				try:
+					os.replace(partPath, localPath)
+				except OSError as err:
+					return f"Failed to move {partPath} to {localPath}: {err}"
+				if progressCallback and not self.cancelRequested:
+					progressCallback(fileName, actualSize, actualSize, 100.0)
+				return "Download completed"
 		return f"HTTP {error.response.status_code if error.response else 'Error'}: {str(error)}"
 
-	def _waitForRetry(self, attempt: int, threadId: int) -> bool:
-		"""Wait for retry."""
-		wait = BACKOFF_BASE**attempt
-		for _ in range(wait):
-			if self.cancelRequested:
-				return False
-			time.sleep(1)
-		return True
+	@staticmethod
+	def _getRetryAfter(response: Response | None) -> float | None:
+		"""
+		Get the delay in seconds a response asks for before retrying, from its ``Retry-After`` header.
+
+		:return: The delay capped to ``RETRY_AFTER_CAP``, or None if the response doesn't specify one.
+		"""
+		if response is None:
+			return None
+		retryAfter = response.headers.get("Retry-After")
+		if not retryAfter:
+			return None
+		try:
+			delay = float(retryAfter)
+		except ValueError:
+			# An HTTP date rather than a number of seconds
+			try:
+				retryAt = parsedate_to_datetime(retryAfter)
+			except (TypeError, ValueError):
+				return None
+			delay = retryAt.timestamp() - time.time()
+		return min(max(delay, 0.0), RETRY_AFTER_CAP)
+
+	def _waitForRetry(self, attempt: int, threadId: int, retryAfter: float | None = None) -> bool:
+		"""
+		Wait for retry.
+
+		Without a delay requested by the server, the wait is drawn uniformly up to the exponential backoff
+		("full jitter"), so threads failing together don't retry in lockstep.
+
+		:param retryAfter: Delay in seconds requested by the server, if any.
+		:return: False if the download was cancelled while waiting.
+		"""
+		if retryAfter is None:
+			wait = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE**attempt))
+		else:
+			wait = retryAfter
+		return not self._cancelEvent.wait(wait)
 
 	def downloadModelsMultithreaded(
 		self,
@@ -439,9 +945,20 @@ class ModelDownloader:
 		filesToDownload: Optional[List[str]] = None,
 		resolvePath: str = "/resolve/main",
 		progressCallback: Optional[ProgressCallback] = None,
-		maxWorkers: int = 4
+		maxWorkers: int = 4,
+		forceDownload: bool = False,
+		cachedCallback: Optional[Callable[[str], None]] = None,
+		resumePartial: bool = True,
 	) -> Tuple[List[str], List[str]]:
-		"""Download multiple model assets concurrently."""
+		"""Download multiple model assets concurrently.
+
+		Files already complete locally are skipped unless ``forceDownload`` is set.
+
+		:param forceDownload: Download every file from scratch, even if a complete or partial copy exists.
+		:param cachedCallback: Called with the path of each file skipped because it was already complete.
+		:param resumePartial: Resume incomplete earlier downloads, rather than discarding them and starting over.
+		:return: Lists of the files that are now available and of those that failed.
+		"""
 		if not self.remoteHost or not modelName:
 			raise ValueError("remoteHost and modelName cannot be empty")
 
@@ -457,39 +974,70 @@ class ModelDownloader:
 		successful: List[str] = []
 		failed: List[str] = []
 
-		with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
-			futures = []
-
-			for path in filesToDownload:
-				if self.cancelRequested:
-					break
-
-				future = executor.submit(
-					self.downloadSingleFile,
-					self.constructDownloadUrl(modelName, path, resolvePath),
-					os.path.join(localModelDir, path),
-					progressCallback,
-				)
-				futures.append((future, path))
+		def getRemoteFileInfo(url: str) -> Tuple[int, bool, str] | None:
+			try:
+				return self._getRemoteFileInfo(url)
+			except FileNotFoundError as e:
+				log.warning(str(e))
+				return None
 
-				with self.downloadLock:
-					self.activeFutures.add(future)
+		urls = [self.constructDownloadUrl(modelName, path, resolvePath) for path in filesToDownload]
 
-			for future, filePath in futures:
-				if self.cancelRequested:
-					break
+		# Progress from all workers is coalesced, so the callback runs at most once per file per interval
+		coalescedCallback = _ProgressCoalescer(progressCallback) if progressCallback else None
+		try:
+			with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+				# Look every file up first, so missing files fail before anything is downloaded
+				# and the largest files start first instead of finishing last.
+				remoteInfos = list(executor.map(getRemoteFileInfo, urls))
+				pending = []
+				for path, url, remoteInfo in zip(filesToDownload, urls, remoteInfos):
+					if remoteInfo is None:
+						failed.append(path)
+					else:
+						pending.append((path, url, remoteInfo))
+				pending.sort(key=lambda item: item[2][0], reverse=True)
 
-				with self.downloadLock:
-					self.activeFutures.discard(future)
+				futures = []
 
-				try:
-					ok, msg = future.result()
-					if ok:
-						successful.append(filePath)
-					else:
+				for path, url, remoteInfo in pending:
+					if self.cancelRequested:
+						break
+
+					future = executor.submit(
+						self.downloadSingleFile,
+						url,
+						os.path.join(localModelDir, path),
+						coalescedCallback,
+						remoteInfo,
+						forceDownload,
+						resumePartial,
+					)
+					futures.append((future, path))
+
+					with self.downloadLock:
+						self.activeFutures.add(future)
+
+				for future, filePath in futures:
+					if self.cancelRequested:
+						break
+
+					with self.downloadLock:
+						self.activeFutures.discard(future)
+
+					try:
+						ok, msg = future.result()
+						if ok:
+							successful.append(filePath)
+							if cachedCallback and msg.startswith("File already"):
+								cachedCallback(filePath)
+						else:
+							failed.append(filePath)
+					except Exception:
 						failed.append(filePath)
-				except Exception:
-					failed.append(filePath)
+		finally:
+			if coalescedCallback:
+				coalescedCallback.close()
 
 		return successful, failed
 
@@ -6,13 +6,13 @@
 
 import wx
 import os
+import posixpath
 import threading
 import json
-import urllib.request
+from collections import deque
 from typing import List, Tuple, Optional
-import winsound
 
-from .modelDownloader import ModelDownloader
+from .captioner import DEFAULT_ONNX_PRECISION, ONNX_PRECISION_SUFFIXES, onnxVariantFileName
 
 try:
 	from logHandler import log
@@ -23,6 +23,21 @@ except:
 
 MODELS_CONFIG_URL = "https://raw.githubusercontent.com/tianzeshi-study/CaptionLocal/master/addon/globalPlugins/CaptionLocal/models.json"
 MODELS_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "models.json")
+# Bounds of the number of concurrent downloads, matching the maxDownloadWorkers config spec
+MIN_DOWNLOAD_WORKERS = 1
+MAX_DOWNLOAD_WORKERS = 16
+# Interval (in milliseconds) at which queued log lines and status changes are applied to the frame
+UI_FLUSH_INTERVAL_MS = 100
+# Seconds to wait for a cancelled download to stop when the frame is destroyed
+DOWNLOAD_STOP_TIMEOUT = 2
+# Number of most recent lines kept in the download log
+LOG_MAX_LINES = 500
+
+
+def _setLabelIfChanged(control: wx.Control, label: str) -> None:
+	"""Set a control's label only when it differs, avoiding a needless repaint and announcement."""
+	if control.GetLabel() != label:
+		control.SetLabel(label)
 
 
 def _closeWindowOnEscape(window: wx.TopLevelWindow) -> None:
@@ -41,12 +56,25 @@ def _bindEscapeToClose(window: wx.TopLevelWindow) -> None:
 
 	window.Bind(wx.EVT_CHAR_HOOK, onCharHook)
 
+def _normalizeRepoPath(path: str) -> str:
+	"""Normalize a file path within a model repository, e.g. "/onnx\\model.onnx" to "onnx/model.onnx".
+
+	:param path: The path as entered or listed.
+	:return: The normalized path, or an empty string if it does not name a file inside the repository.
+	"""
+	path = posixpath.normpath(path.strip().replace("\\", "/").lstrip("/"))
+	if path == "." or path == ".." or path.startswith("../"):
+		return ""
+	return path
+
+
 class AdvancedSettingsDialog(wx.Dialog):
 	"""Advanced Settings Dialog for model download configuration."""
 	
 	def __init__(self, parent, modelName: str = "Xenova/vit-gpt2-image-captioning", 
 				 filesList: Optional[List[str]] = None, resolvePath: str = "/resolve/main", 
-				 useMirror: bool = False):
+				 useMirror: bool = False, maxWorkers: int = 4, forceDownload: bool = False,
+				 resumePartial: bool = True, precision: str = DEFAULT_ONNX_PRECISION):
 		super().__init__(parent, title=_("Advanced Settings"), size=(500, 400),
 						style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
 		
@@ -58,8 +86,13 @@ class AdvancedSettingsDialog(wx.Dialog):
 			"vocab.json",
 			"preprocessor_config.json"
 		]
+		self._filesSet = set(self.filesList)
 		self.resolvePath = resolvePath
 		self.useMirror = useMirror
+		self.maxWorkers = maxWorkers
+		self.forceDownload = forceDownload
+		self.resumePartial = resumePartial
+		self.precision = precision
 		
 		self._initUI()
 		self._bindEvents()
@@ -83,15 +116,46 @@ class AdvancedSettingsDialog(wx.Dialog):
 		self.useMirrorCb.SetValue(self.useMirror)
 		modelSizer.Add(self.useMirrorCb, 0, wx.ALL, 5)
 		
+		modelSizer.Add(wx.StaticText(modelPanel, label=_("Concurrent downloads:")), 0, wx.ALL, 5)
+		self.maxWorkersCtrl = wx.SpinCtrl(
+			modelPanel, min=MIN_DOWNLOAD_WORKERS, max=MAX_DOWNLOAD_WORKERS, initial=self.maxWorkers
+		)
+		modelSizer.Add(self.maxWorkersCtrl, 0, wx.ALL, 5)
+		
+		self.forceDownloadCb = wx.CheckBox(modelPanel, label=_("Download files again even if already downloaded"))
+		self.forceDownloadCb.SetValue(self.forceDownload)
+		modelSizer.Add(self.forceDownloadCb, 0, wx.ALL, 5)
+		
+		self.resumePartialCb = wx.CheckBox(modelPanel, label=_("Resume partial downloads"))
+		self.resumePartialCb.SetValue(self.resumePartial)
+		modelSizer.Add(self.resumePartialCb, 0, wx.ALL, 5)
+		
+		self._precisionChoices = list(ONNX_PRECISION_SUFFIXES)
+		precisionLabels = {
+			"quantized": _("Quantized (default, smallest)"),
+			"int8": _("Signed 8-bit (int8)"),
+			"uint8": _("Unsigned 8-bit (uint8)"),
+			"fp32": _("Full precision (fp32, largest)"),
+		}
+		self.precisionRadio = wx.RadioBox(
+			modelPanel,
+			label=_("Model precision"),
+			choices=[precisionLabels[precision] for precision in self._precisionChoices],
+			majorDimension=1,
+			style=wx.RA_SPECIFY_COLS,
+		)
+		if self.precision in self._precisionChoices:
+			self.precisionRadio.SetSelection(self._precisionChoices.index(self.precision))
+		modelSizer.Add(self.precisionRadio, 0, wx.ALL, 5)
+		
 		modelPanel.SetSizer(modelSizer)
 		notebook.AddPage(modelPanel, _("Model Config"))
 		
 		filesPanel = wx.Panel(notebook)
 		filesSizer = wx.BoxSizer(wx.VERTICAL)
 		filesSizer.Add(wx.StaticText(filesPanel, label=_("Files to Download:")), 0, wx.ALL, 5)
-		self.filesListbox = wx.ListBox(filesPanel, choices=self.filesList, style=wx.LB_MULTIPLE | wx.LB_HSCROLL)
-		for i in range(len(self.filesList)):
-			self.filesListbox.SetSelection(i)
+		self.filesListbox = wx.CheckListBox(filesPanel, choices=self.filesList, style=wx.LB_HSCROLL)
+		self.filesListbox.SetCheckedItems(range(len(self.filesList)))
 		filesSizer.Add(self.filesListbox, 1, wx.ALL | wx.EXPAND, 5)
 		
 		fileBtnSizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -118,53 +182,68 @@ class AdvancedSettingsDialog(wx.Dialog):
 		dlg = wx.TextEntryDialog(self, _("Enter file path:"), _("Add File"))
 		_bindEscapeToClose(dlg)
 		if dlg.ShowModal() == wx.ID_OK:
-			filePath = dlg.GetValue().strip()
-			if filePath and filePath not in self.filesList:
+			filePath = _normalizeRepoPath(dlg.GetValue())
+			if filePath and filePath not in self._filesSet:
 				self.filesList.append(filePath)
-				self.filesListbox.Append(filePath)
-				self.filesListbox.SetSelection(len(self.filesList) - 1)
+				self._filesSet.add(filePath)
+				index = self.filesListbox.Append(filePath)
+				self.filesListbox.Check(index)
+				self.filesListbox.SetSelection(index)
 		dlg.Destroy()
 		
 	def onRemoveFile(self, event):
-		selection = self.filesListbox.GetSelections()
-		for s in sorted(selection, reverse=True):
-			self.filesList.pop(s)
-			self.filesListbox.Delete(s)
+		selection = self.filesListbox.GetSelection()
+		if selection == wx.NOT_FOUND:
+			return
+		self._filesSet.discard(self.filesList.pop(selection))
+		self.filesListbox.Delete(selection)
 			
 	def getSettings(self) -> dict:
-		selectedFiles = []
-		for i in range(self.filesListbox.GetCount()):
-			if self.filesListbox.IsSelected(i):
-				selectedFiles.append(self.filesList[i])
+		# Normalize and drop duplicates, keeping the listed order, so no file is queued twice
+		selectedFiles = list(dict.fromkeys(
+			path for path in (_normalizeRepoPath(self.filesList[i]) for i in self.filesListbox.GetCheckedItems())
+			if path
+		))
 		
 		return {
 			'modelName': self.modelNameCtrl.GetValue().strip(),
 			'filesToDownload': selectedFiles,
 			'resolvePath': self.resolvePathCtrl.GetValue().strip(),
-			'useMirror': self.useMirrorCb.GetValue()
+			'useMirror': self.useMirrorCb.GetValue(),
+			'maxWorkers': self.maxWorkersCtrl.GetValue(),
+			'forceDownload': self.forceDownloadCb.GetValue(),
+			'resumePartial': self.resumePartialCb.GetValue(),
+			'precision': self._precisionChoices[self.precisionRadio.GetSelection()]
 		}
 
 
 class SoundNotification:
 	@staticmethod
-	def playStart():
-		try: winsound.MessageBeep(winsound.MB_ICONASTERISK)
+	def _play(alias: str):
+		"""Play a system sound by alias without waiting for it to finish.
+
+		:param alias: The registry sound alias, e.g. "SystemAsterisk".
+		"""
+		try:
+			import winsound
+			winsound.PlaySound(alias, winsound.SND_ALIAS | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
 		except: pass
 	
+	@staticmethod
+	def playStart():
+		SoundNotification._play("SystemAsterisk")
+	
 	@staticmethod
 	def playSuccess():
-		try: winsound.MessageBeep(winsound.MB_OK)
-		except: pass
+		SoundNotification._play("SystemDefault")
 	
 	@staticmethod
 	def playError():
-		try: winsound.MessageBeep(winsound.MB_ICONHAND)
-		except: pass
+		SoundNotification._play("SystemHand")
 	
 	@staticmethod
 	def playWarning():
-		try: winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-		except: pass
+		SoundNotification._play("SystemExclamation")
 
 
 class ModelManagerFrame(wx.Frame):
@@ -186,6 +265,10 @@ class ModelManagerFrame(wx.Frame):
 		]
 		self.resolvePath = "/resolve/main"
 		self.useMirror = False
+		self.maxWorkers = self._loadMaxWorkers()
+		self.forceDownload = False
+		self.resumePartial = self._loadResumePartial()
+		self.precision = self._loadPrecision()
 		
 		if self.modelsConfig:
 			self._applyModelConfig(self.modelsConfig[0])
@@ -193,12 +276,23 @@ class ModelManagerFrame(wx.Frame):
 		self.downloader = None
 		self.downloadThread = None
 		
+		# Log lines and the latest status posted from worker threads, applied together by a timer
+		self._pendingLogLines = deque()
+		# Lines currently shown in the log control, oldest dropped first
+		self._logLines = deque(maxlen=LOG_MAX_LINES)
+		self._pendingStatus = None
+		self._pendingLock = threading.Lock()
+		
 		self._initUI()
 		self._initDefaultPath()
 		self._bindEvents()
 		_bindEscapeToClose(self)
 		self.Centre()
 		
+		self._flushTimer = wx.Timer(self)
+		self.Bind(wx.EVT_TIMER, self._onFlushTimer, self._flushTimer)
+		self._flushTimer.Start(UI_FLUSH_INTERVAL_MS)
+		
 	def _initUI(self):
 		panel = wx.Panel(self)
 		mainSizer = wx.BoxSizer(wx.VERTICAL)
@@ -252,7 +346,8 @@ class ModelManagerFrame(wx.Frame):
 		btnSizer.Add(self.downloadBtn, 0, wx.ALL, 5)
 		mainSizer.Add(btnSizer, 0, wx.ALL | wx.EXPAND, 10)
 		
-		self.statusText = wx.StaticText(panel, label=_("Ready"))
+		# The status line is stretched by the sizer, so label changes need not resize it
+		self.statusText = wx.StaticText(panel, label=_("Ready"), style=wx.ST_NO_AUTORESIZE)
 		mainSizer.Add(self.statusText, 0, wx.ALL | wx.EXPAND, 10)
 		
 		logBox = wx.StaticBoxSizer(wx.StaticBox(panel, label=_("Download Log")), wx.VERTICAL)
@@ -270,6 +365,30 @@ class ModelManagerFrame(wx.Frame):
 		except:
 			pass
 			
+	@staticmethod
+	def _loadMaxWorkers() -> int:
+		import config
+		try:
+			return config.conf["captionLocal"]["maxDownloadWorkers"]
+		except Exception:
+			return 4
+
+	@staticmethod
+	def _loadResumePartial() -> bool:
+		import config
+		try:
+			return config.conf["captionLocal"]["resumeDownloads"]
+		except Exception:
+			return True
+
+	@staticmethod
+	def _loadPrecision() -> str:
+		import config
+		try:
+			return config.conf["captionLocal"]["modelPrecision"]
+		except Exception:
+			return DEFAULT_ONNX_PRECISION
+
 	def _loadLocalConfig(self):
 		try:
 			if os.path.exists(MODELS_CONFIG_FILE):
@@ -277,7 +396,7 @@ class ModelManagerFrame(wx.Frame):
 					data = json.load(f)
 					self.modelsConfig = data.get("models", [])
 		except Exception as e:
-			print(f"Error loading local models config: {e}")
+			log.error(f"Error loading local models config: {e}")
 
 	def _applyModelConfig(self, modelData):
 		self.modelName = modelData.get("id", "Unknown")
@@ -292,25 +411,66 @@ class ModelManagerFrame(wx.Frame):
 		self.modelCombo.Bind(wx.EVT_COMBOBOX, self.onModelSelect)
 		self.updateConfigBtn.Bind(wx.EVT_BUTTON, self.onUpdateConfig)
 		self.Bind(wx.EVT_CLOSE, self.onClose)
+		self.Bind(wx.EVT_SHOW, self.onShow)
 		
 	def log(self, message: str):
-		wx.CallAfter(self._logSafe, message)
-		
-	def _logSafe(self, message: str):
-		if not self.IsBeingDeleted():
-			self.logText.AppendText(f"{message}\n")
-			self.logText.SetInsertionPointEnd()
+		with self._pendingLock:
+			self._pendingLogLines.append(message)
 			
 	def updateStatus(self, status: str):
-		wx.CallAfter(self._updateStatusSafe, status)
-		
-	def _updateStatusSafe(self, status: str):
-		if not self.IsBeingDeleted():
-			self.statusText.SetLabel(status)
+		with self._pendingLock:
+			self._pendingStatus = status
+		
+	def _onFlushTimer(self, event):
+		"""Apply queued log lines with a single append, and only the latest queued status."""
+		with self._pendingLock:
+			lines = self._pendingLogLines
+			self._pendingLogLines = deque()
+			status = self._pendingStatus
+			self._pendingStatus = None
+		if self.IsBeingDeleted():
+			return
+		if lines:
+			self._appendLogLines(lines)
+		if status is not None:
+			_setLabelIfChanged(self.statusText, status)
+			
+	def _appendLogLines(self, lines: deque):
+		"""Show new log lines, keeping at most LOG_MAX_LINES in the control.
+
+		The caret only follows new lines when it is already at the end, so reading earlier lines is not interrupted.
+		"""
+		insertionPoint = self.logText.GetInsertionPoint()
+		followEnd = insertionPoint == self.logText.GetLastPosition()
+		droppedCount = len(self._logLines) + len(lines) - LOG_MAX_LINES
+		if droppedCount > 0:
+			# Keep the caret by line and column, positions count a line break as two on Windows
+			isValid, column, lineNumber = self.logText.PositionToXY(insertionPoint)
+			self._logLines.extend(lines)
+			self.logText.ChangeValue("\n".join(self._logLines) + "\n")
+			if isValid and lineNumber >= droppedCount:
+				insertionPoint = self.logText.XYToPosition(column, lineNumber - droppedCount)
+			else:
+				# The caret was on a dropped line, move it to the oldest line kept
+				insertionPoint = 0
+		else:
+			self._logLines.extend(lines)
+			self.logText.AppendText("\n".join(lines) + "\n")
+		if followEnd:
+			self.logText.SetInsertionPointEnd()
+		elif insertionPoint >= 0:
+			self.logText.SetInsertionPoint(insertionPoint)
 			
 	def updateProgress(self, fileName: str, downloaded: int, total: int, progressPercent: float):
 		self.log(_("file: {fileName}  progress: {progress:.2f}%").format(fileName=fileName, progress=progressPercent))
 	
+	def onFileCached(self, filePath: str):
+		self.log(_("cached: {filePath}").format(filePath=filePath))
+	
+	def _updateModelInfo(self):
+		_setLabelIfChanged(self.modelInfoText, _("Model: {modelName}").format(modelName=self.modelName))
+		_setLabelIfChanged(self.filesInfoText, _("File Count: {count}").format(count=len(self.filesToDownload)))
+	
 	def onBrowsePath(self, event):
 		dlg = wx.DirDialog(self, _("Select Download Directory"), defaultPath=self.pathCtrl.GetValue())
 		_bindEscapeToClose(dlg)
@@ -319,27 +479,45 @@ class ModelManagerFrame(wx.Frame):
 		dlg.Destroy()
 		
 	def onAdvancedSettings(self, event):
-		dlg = AdvancedSettingsDialog(self, self.modelName, self.filesToDownload, self.resolvePath, self.useMirror)
+		dlg = AdvancedSettingsDialog(
+			self,
+			self.modelName,
+			self.filesToDownload,
+			self.resolvePath,
+			self.useMirror,
+			self.maxWorkers,
+			self.forceDownload,
+			self.resumePartial,
+			self.precision,
+		)
 		if dlg.ShowModal() == wx.ID_OK:
 			settings = dlg.getSettings()
 			self.modelName = settings['modelName']
 			self.filesToDownload = settings['filesToDownload']
 			self.resolvePath = settings['resolvePath']
 			self.useMirror = settings['useMirror']
-			self.modelInfoText.SetLabel(_("Model: {modelName}").format(modelName=self.modelName))
-			self.filesInfoText.SetLabel(_("File Count: {count}").format(count=len(self.filesToDownload)))
+			self.maxWorkers = settings['maxWorkers']
+			self.forceDownload = settings['forceDownload']
+			self.resumePartial = settings['resumePartial']
+			self.precision = settings['precision']
+			import config
+			try:
+				config.conf["captionLocal"]["maxDownloadWorkers"] = self.maxWorkers
+				config.conf["captionLocal"]["resumeDownloads"] = self.resumePartial
+			except Exception:
+				log.debugWarning("Could not save download settings", exc_info=True)
+			self._updateModelInfo()
 		dlg.Destroy()
 		
 	def onModelSelect(self, event):
 		sel = self.modelCombo.GetSelection()
 		if sel != wx.NOT_FOUND and sel < len(self.modelsConfig):
 			self._applyModelConfig(self.modelsConfig[sel])
-			self.modelInfoText.SetLabel(_("Model: {modelName}").format(modelName=self.modelName))
-			self.filesInfoText.SetLabel(_("File Count: {count}").format(count=len(self.filesToDownload)))
+			self._updateModelInfo()
 
 	def onUpdateConfig(self, event):
 		self.updateConfigBtn.Disable()
-		self.statusText.SetLabel(_("Updating models list..."))
+		_setLabelIfChanged(self.statusText, _("Updating models list..."))
 		threading.Thread(target=self._updateConfigWorker, daemon=True).start()
 		
 	def onSetActive(self, event):
@@ -367,6 +545,11 @@ class ModelManagerFrame(wx.Frame):
 
 			config.conf["captionLocal"]["modelsDir"] = modelsDir
 			config.conf["captionLocal"]["currentModel"] = newModelId
+			# The precision setting is shared by all models, use the one this model was downloaded with
+			from .imageDescriber import findInstalledPrecision
+			installedPrecision = findInstalledPrecision(os.path.join(modelsDir, newModelId), self.precision)
+			if installedPrecision is not None:
+				config.conf["captionLocal"]["modelPrecision"] = installedPrecision
 			self.log(_("✅ Active model set to: {modelName}").format(modelName=newModelId))
 			SoundNotification.playSuccess()
 		except Exception as e:
@@ -376,6 +559,7 @@ class ModelManagerFrame(wx.Frame):
 
 	def _updateConfigWorker(self):
 		try:
+			import urllib.request
 			req = urllib.request.Request(MODELS_CONFIG_URL, headers={'User-Agent': 'Mozilla/5.0'})
 			with urllib.request.urlopen(req, timeout=10) as response:
 				data = json.loads(response.read().decode('utf-8'))
@@ -396,14 +580,13 @@ class ModelManagerFrame(wx.Frame):
 		if choices:
 			self.modelCombo.SetSelection(0)
 			self._applyModelConfig(self.modelsConfig[0])
-			self.modelInfoText.SetLabel(_("Model: {modelName}").format(modelName=self.modelName))
-			self.filesInfoText.SetLabel(_("File Count: {count}").format(count=len(self.filesToDownload)))
-		self.statusText.SetLabel(_("Models list updated successfully."))
+			self._updateModelInfo()
+		_setLabelIfChanged(self.statusText, _("Models list updated successfully."))
 		self.updateConfigBtn.Enable()
 		SoundNotification.playSuccess()
 
 	def _updateConfigFail(self, error):
-		self.statusText.SetLabel(_("Failed to update models list: {error}").format(error=error))
+		_setLabelIfChanged(self.statusText, _("Failed to update models list: {error}").format(error=error))
 		self.updateConfigBtn.Enable()
 		SoundNotification.playError()
 
@@ -416,6 +599,7 @@ class ModelManagerFrame(wx.Frame):
 			
 		self.downloadBtn.SetLabel(_("Cancel Download"))
 		SoundNotification.playStart()
+		self._startFlushTimer()
 		self.downloadThread = threading.Thread(target=self._downloadWorker)
 		self.downloadThread.daemon = True
 		self.downloadThread.start()
@@ -424,16 +608,34 @@ class ModelManagerFrame(wx.Frame):
 		try:
 			self.updateStatus(_("Downloading..."))
 			remoteHost = "hf-mirror.com" if self.useMirror else "huggingface.co"
-			self.downloader = ModelDownloader(remoteHost=remoteHost)
+			if (
+				self.downloader is None
+				or self.downloader.remoteHost != remoteHost
+				or self.downloader.maxWorkers != self.maxWorkers
+			):
+				# Imported here so requests is only loaded once a download is started
+				from .modelDownloader import ModelDownloader
+				self.downloader = ModelDownloader(remoteHost=remoteHost, maxWorkers=self.maxWorkers)
+			else:
+				# Reuse the downloader, so later downloads from the same host keep its pooled connections
+				self.downloader.resetCancellation()
 			
 			downloadPath = self.pathCtrl.GetValue()
+			# Quantized model files are listed, fetch the variant of the chosen precision instead
+			precision = self.precision
+			filesToDownload = [onnxVariantFileName(fileName, precision) for fileName in self.filesToDownload]
 			# Models are saved to downloadPath/modelName
 			successful, failed = self.downloader.downloadModelsMultithreaded(
 				modelsDir=downloadPath,
 				modelName=self.modelName,
-				filesToDownload=self.filesToDownload,
+				filesToDownload=filesToDownload,
 				resolvePath=self.resolvePath,
-				progressCallback=self.updateProgress
+				progressCallback=self.updateProgress,
+				# No more workers than files, extra threads would only sit idle
+				maxWorkers=max(1, min(self.maxWorkers, len(filesToDownload))),
+				forceDownload=self.forceDownload,
+				cachedCallback=self.onFileCached,
+				resumePartial=self.resumePartial,
 			)
 			
 			if self.downloader.cancelRequested:
@@ -447,6 +649,8 @@ class ModelManagerFrame(wx.Frame):
 				import config
 				config.conf["captionLocal"]["modelsDir"] = downloadPath
 				config.conf["captionLocal"]["currentModel"] = self.modelName
+				# Only now do the files of this precision exist, so the captioner can load them
+				config.conf["captionLocal"]["modelPrecision"] = precision
 			else:
 				self.log(_("❌ Download failed for some files."))
 				self.updateStatus(_("Failed"))
@@ -461,8 +665,28 @@ class ModelManagerFrame(wx.Frame):
 	def _downloadFinished(self):
 		self.downloadBtn.SetLabel(_("Start Download"))
 		
+	def _startFlushTimer(self):
+		if not self._flushTimer.IsRunning():
+			self._flushTimer.Start(UI_FLUSH_INTERVAL_MS)
+		
+	def onShow(self, event):
+		if event.IsShown():
+			self._startFlushTimer()
+		event.Skip()
+		
 	def onClose(self, event):
 		if self.downloadThread and self.downloadThread.is_alive():
 			if self.downloader:
 				self.downloader.requestCancel()
+		if event.CanVeto():
+			# Keep the frame around so reopening does not rebuild the control tree
+			event.Veto()
+			self.Hide()
+			# Queued lines are kept and shown once the frame is shown again
+			self._flushTimer.Stop()
+			return
+		if self.downloadThread and self.downloadThread.is_alive():
+			# Give the cancelled download a moment to stop before the frame it reports to goes away
+			self.downloadThread.join(timeout=DOWNLOAD_STOP_TIMEOUT)
+		self._flushTimer.Stop()
 		self.Destroy()
@@ -5,7 +5,6 @@
 
 from __future__ import unicode_literals
 
-from typing import Optional
 import wx
 
 import gui
@@ -74,23 +73,6 @@ class CaptionLocalSettingsPanel(gui.settingsDialogs.SettingsPanel):
 		self.loadModelWhenInit = sHelper.addItem(wx.CheckBox(self, label=_("load model when init (may cause high use of memory)")))
 		self.loadModelWhenInit.SetValue(config.conf['captionLocal']['loadModelWhenInit'])
 
-	@staticmethod
-	def getParameterBound(name: str, boundType: str) -> Optional[int]:
-		"""Get the bound of a parameter in the "ndtt" section of the config.
-		
-		Args:
-			name: The name of the parameter.
-			boundType: Either "min" or "max".
-			
-		Returns:
-			The bound value if found, None otherwise.
-		"""
-		try:
-			return config.conf.getConfigValidation(("ndtt", name)).kwargs[boundType]
-		except TypeError:
-			# For older version of configObj (e.g. used in NVDA 2019.2.1)
-			return config.conf.getConfigValidationParameter(["ndtt", name], boundType)
-
 	def onSave(self) -> None:
 		"""Save the configuration settings.
 		
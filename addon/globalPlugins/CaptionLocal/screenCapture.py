@@ -0,0 +1,151 @@
+# -*- coding: UTF-8 -*-
+# A part of NonVisual Desktop Access (NVDA)
+# Copyright (C) 2025 NV Access Limited, Tianze
+# This file may be used under the terms of the GNU General Public License, version 2 or later, as modified by the NVDA license.
+# For full terms and any additional permissions, see the NVDA license file: https://github.com/nvaccess/nvda/blob/master/copying.txt
+
+"""Screen capture through Win32 GDI.
+
+Pixels are copied with ``BitBlt`` and read back with ``GetDIBits`` straight into a NumPy buffer,
+without going through wx bitmaps and images.
+"""
+
+import ctypes
+from ctypes import wintypes
+
+import numpy as np
+
+SRCCOPY = 0x00CC0020
+# Include layered windows in the capture
+CAPTUREBLT = 0x40000000
+BI_RGB = 0
+DIB_RGB_COLORS = 0
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+	_fields_ = [
+		("biSize", wintypes.DWORD),
+		("biWidth", wintypes.LONG),
+		("biHeight", wintypes.LONG),
+		("biPlanes", wintypes.WORD),
+		("biBitCount", wintypes.WORD),
+		("biCompression", wintypes.DWORD),
+		("biSizeImage", wintypes.DWORD),
+		("biXPelsPerMeter", wintypes.LONG),
+		("biYPelsPerMeter", wintypes.LONG),
+		("biClrUsed", wintypes.DWORD),
+		("biClrImportant", wintypes.DWORD),
+	]
+
+
+_user32 = None
+_gdi32 = None
+
+
+def _loadGdi() -> None:
+	"""Load private user32/gdi32 bindings with pointer sized handle types."""
+	global _user32, _gdi32
+	if _gdi32 is not None:
+		return
+
+	# Private WinDLL instances, so setting argtypes doesn't affect other users of ctypes.windll
+	user32 = ctypes.WinDLL("user32", use_last_error=True)
+	gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+
+	user32.GetDC.argtypes = [wintypes.HWND]
+	user32.GetDC.restype = wintypes.HDC
+	user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+	gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+	gdi32.CreateCompatibleDC.restype = wintypes.HDC
+	gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+	gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+	gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+	gdi32.SelectObject.restype = wintypes.HGDIOBJ
+	gdi32.BitBlt.argtypes = [
+		wintypes.HDC,
+		ctypes.c_int,
+		ctypes.c_int,
+		ctypes.c_int,
+		ctypes.c_int,
+		wintypes.HDC,
+		ctypes.c_int,
+		ctypes.c_int,
+		wintypes.DWORD,
+	]
+	gdi32.GetDIBits.argtypes = [
+		wintypes.HDC,
+		wintypes.HBITMAP,
+		wintypes.UINT,
+		wintypes.UINT,
+		ctypes.c_void_p,
+		ctypes.POINTER(BITMAPINFOHEADER),
+		wintypes.UINT,
+	]
+	gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+	gdi32.DeleteDC.argtypes = [wintypes.HDC]
+
+	_user32, _gdi32 = user32, gdi32
+
+
+def captureScreenRegion(x: int, y: int, width: int, height: int) -> np.ndarray:
+	"""Capture a region of the screen.
+
+	:param x: Left edge of the region in screen coordinates.
+	:param y: Top edge of the region in screen coordinates.
+	:param width: Width of the region in pixels.
+	:param height: Height of the region in pixels.
+	:return: The captured pixels as an RGB uint8 array of shape (height, width, 3).
+	:raises ValueError: If the region is empty.
+	:raises OSError: If a GDI call fails.
+	"""
+	if width <= 0 or height <= 0:
+		raise ValueError(f"Cannot capture an empty screen region ({width}x{height})")
+	_loadGdi()
+
+	screenDC = _user32.GetDC(None)
+	if not screenDC:
+		raise ctypes.WinError(ctypes.get_last_error())
+	memDC = bitmap = oldBitmap = None
+	try:
+		memDC = _gdi32.CreateCompatibleDC(screenDC)
+		bitmap = _gdi32.CreateCompatibleBitmap(screenDC, width, height)
+		if not memDC or not bitmap:
+			raise ctypes.WinError(ctypes.get_last_error())
+		oldBitmap = _gdi32.SelectObject(memDC, bitmap)
+		if not _gdi32.BitBlt(memDC, 0, 0, width, height, screenDC, x, y, SRCCOPY | CAPTUREBLT):
+			raise ctypes.WinError(ctypes.get_last_error())
+		# The bitmap must not be selected into a DC while GetDIBits reads it
+		_gdi32.SelectObject(memDC, oldBitmap)
+		oldBitmap = None
+
+		header = BITMAPINFOHEADER()
+		header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+		header.biWidth = width
+		# A negative height gives top-down rows, matching NumPy's row order
+		header.biHeight = -height
+		header.biPlanes = 1
+		header.biBitCount = 32
+		header.biCompression = BI_RGB
+
+		bgra = np.empty((height, width, 4), dtype=np.uint8)
+		lines = _gdi32.GetDIBits(
+			memDC,
+			bitmap,
+			0,
+			height,
+			bgra.ctypes.data,
+			ctypes.byref(header),
+			DIB_RGB_COLORS,
+		)
+		if lines != height:
+			raise ctypes.WinError(ctypes.get_last_error())
+		# A contiguous RGB copy, so the BGRA buffer is freed once the capture returns
+		return bgra[:, :, 2::-1].copy()
+	finally:
+		if oldBitmap is not None:
+			_gdi32.SelectObject(memDC, oldBitmap)
+		if bitmap:
+			_gdi32.DeleteObject(bitmap)
+		if memDC:
+			_gdi32.DeleteDC(memDC)
+		_user32.ReleaseDC(None, screenDC)
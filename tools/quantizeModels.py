@@ -0,0 +1,116 @@
+# -*- coding: UTF-8 -*-
+# A part of NonVisual Desktop Access (NVDA)
+# Copyright (C) 2025 NV Access Limited, Tianze
+# This file may be used under the terms of the GNU General Public License, version 2 or later, as modified by the NVDA license.
+# For full terms and any additional permissions, see the NVDA license file: https://github.com/nvaccess/nvda/blob/master/copying.txt
+
+"""Quantize caption models to INT8 weights for faster CPU inference.
+
+This is a developer tool and is not shipped with the add-on.
+It requires the ``onnx`` and ``onnxruntime`` packages::
+
+	python tools/quantizeModels.py models/my-model/onnx/decoder_model_merged.onnx
+
+The quantized model is written next to the input as ``<name>_quantized.onnx``, which is the
+file name the add-on loads. After quantization the graph is checked, and the script fails
+if most matrix multiplications are still floating point.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+# Node types produced by dynamic quantization of MatMul/Gemm
+_QUANTIZED_OP_TYPES = frozenset({
+	"MatMulInteger",
+	"DynamicQuantizeMatMul",
+	"MatMulIntegerToFloat",
+	"QLinearMatMul",
+	"QGemm",
+})
+_FLOAT_OP_TYPES = frozenset({"MatMul", "Gemm"})
+
+
+def quantizeModel(inputPath: str, outputPath: str, reduceRange: bool = True) -> None:
+	"""Quantize the MatMul/Gemm weights of a model to signed 8 bit integers.
+
+	Activations are quantized to unsigned 8 bit integers at run time, so ONNX Runtime can use its
+	u8s8 integer GEMM kernels (VNNI/AMX where available).
+
+	:param inputPath: Path to the floating point ONNX model.
+	:param outputPath: Path to write the quantized model to.
+	:param reduceRange: Quantize weights to 7 bits, which avoids accumulator saturation
+		on CPUs without VNNI. Models distributed to unknown hardware should keep this enabled.
+	"""
+	from onnxruntime.quantization import QuantType, quantize_dynamic
+
+	quantize_dynamic(
+		inputPath,
+		outputPath,
+		weight_type=QuantType.QInt8,
+		per_channel=True,
+		reduce_range=reduceRange,
+		op_types_to_quantize=["MatMul", "Gemm"],
+	)
+
+
+def countMatMulOps(modelPath: str) -> tuple[int, int]:
+	"""Count quantized and floating point matrix multiplications in a model, including subgraphs.
+
+	:param modelPath: Path to the ONNX model.
+	:return: Tuple of (quantized count, floating point count).
+	"""
+	import onnx
+
+	model = onnx.load(modelPath, load_external_data=False)
+	opTypes = Counter()
+	graphs = [model.graph]
+	while graphs:
+		graph = graphs.pop()
+		for node in graph.node:
+			opTypes[node.op_type] += 1
+			# Merged decoders keep their branches in If node subgraphs
+			for attribute in node.attribute:
+				if attribute.type == onnx.AttributeProto.GRAPH:
+					graphs.append(attribute.g)
+				graphs.extend(attribute.graphs)
+
+	quantized = sum(opTypes[opType] for opType in _QUANTIZED_OP_TYPES)
+	floating = sum(opTypes[opType] for opType in _FLOAT_OP_TYPES)
+	return quantized, floating
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("models", nargs="+", help="floating point ONNX models to quantize")
+	parser.add_argument(
+		"--check-only",
+		action="store_true",
+		help="only report quantized operator coverage of the given models",
+	)
+	parser.add_argument(
+		"--full-range",
+		action="store_true",
+		help="quantize weights to the full 8 bit range, only for models run on CPUs with VNNI",
+	)
+	args = parser.parse_args()
+
+	exitCode = 0
+	for modelPath in args.models:
+		if args.check_only:
+			outputPath = modelPath
+		else:
+			outputPath = f"{os.path.splitext(modelPath)[0]}_quantized.onnx"
+			quantizeModel(modelPath, outputPath, reduceRange=not args.full_range)
+
+		quantized, floating = countMatMulOps(outputPath)
+		print(f"{outputPath}: {quantized} quantized, {floating} floating point MatMul/Gemm")
+		if floating > quantized:
+			print(f"error: {outputPath} is dominated by floating point MatMul/Gemm", file=sys.stderr)
+			exitCode = 1
+	return exitCode
+
+
+if __name__ == "__main__":
+	sys.exit(main())